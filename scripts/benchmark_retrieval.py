@@ -0,0 +1,172 @@
+"""
+Recall-versus-latency sweep for Qdrant retrieval settings.
+
+For each question, exact (brute-force) neighbours are computed once as ground
+truth; then every combination of k, HNSW ef and quantization rescoring is run
+and scored. Use the output to set RAG_SEARCH_K / RAG_HNSW_EF /
+RAG_QUANTIZATION_RESCORE / RAG_QUANTIZATION_OVERSAMPLING for `get_retriever`.
+
+    python scripts/benchmark_retrieval.py --questions questions.txt
+    python scripts/benchmark_retrieval.py --sample 200 --k 4,8 --ef 16,32,64,128
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config import get_settings
+from src.embeddings import get_embeddings
+from src.summaries import chunks_only_filter
+from src.vectorstore import build_search_params, get_qdrant_client
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def _load_questions(client, collection: str, path: Optional[str], sample: int) -> List[str]:
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    # No question set: use the opening words of stored chunks as pseudo-queries
+    points, _ = client.scroll(
+        collection, scroll_filter=chunks_only_filter(), limit=sample, with_payload=True, with_vectors=False
+    )
+    questions = []
+    for p in points:
+        text = (p.payload or {}).get("page_content", "")
+        if text:
+            questions.append(" ".join(text.split()[:24]))
+    return questions
+
+
+def _is_quantized(client, collection: str) -> bool:
+    try:
+        info = client.get_collection(collection)
+        return getattr(info.config, "quantization_config", None) is not None
+    except Exception:
+        return False
+
+
+def _search_ids(client, collection: str, vector: List[float], limit: int, search_params) -> List[Any]:
+    # Same filter as get_retriever, so summary nodes count neither as ground truth nor as hits
+    res = client.query_points(
+        collection,
+        query=vector,
+        query_filter=chunks_only_filter(),
+        limit=limit,
+        search_params=search_params,
+        with_payload=False,
+        with_vectors=False,
+    )
+    return [p.id for p in res.points]
+
+
+def run_sweep(
+    collection: str,
+    questions: List[str],
+    ks: List[int],
+    efs: List[int],
+    rescore_options: List[Optional[bool]],
+    oversampling: Optional[float],
+    repeats: int,
+) -> List[Dict[str, Any]]:
+    from qdrant_client.http.models import SearchParams
+
+    client = get_qdrant_client()
+    embeddings = get_embeddings()
+    # Embedded as queries, like the retriever does (some models prefix queries differently);
+    # embedding time is excluded from search latency
+    vectors = [embeddings.embed_query(q) for q in questions]
+    max_k = max(ks)
+    exact = [_search_ids(client, collection, v, max_k, SearchParams(exact=True)) for v in vectors]
+
+    rows: List[Dict[str, Any]] = []
+    for k in ks:
+        for ef in efs:
+            for rescore in rescore_options:
+                params = build_search_params(
+                    hnsw_ef=ef, rescore=rescore, oversampling=oversampling if rescore is not None else None
+                )
+                latencies: List[float] = []
+                recalls: List[float] = []
+                for _ in range(max(1, repeats)):
+                    for vector, truth in zip(vectors, exact):
+                        started = time.perf_counter()
+                        found = _search_ids(client, collection, vector, k, params)
+                        latencies.append(time.perf_counter() - started)
+                        expected = set(truth[:k])
+                        if expected:
+                            recalls.append(len(expected.intersection(found)) / len(expected))
+                total = sum(latencies)
+                rows.append(
+                    {
+                        "k": k,
+                        "ef": ef or "default",
+                        "rescore": "-" if rescore is None else rescore,
+                        "recall": statistics.fmean(recalls) if recalls else 0.0,
+                        "p50_ms": _percentile(latencies, 50) * 1000,
+                        "p95_ms": _percentile(latencies, 95) * 1000,
+                        "qps": len(latencies) / total if total else 0.0,
+                    }
+                )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--collection", default=None, help="Collection or alias (default: QDRANT_COLLECTION)")
+    parser.add_argument("--questions", default=None, help="Text file with one question per line")
+    parser.add_argument("--sample", type=int, default=100, help="Pseudo-queries sampled from stored chunks")
+    parser.add_argument("--k", default="1,4,8,16", help="Comma-separated k values")
+    parser.add_argument("--ef", default="0,16,32,64,128,256", help="Comma-separated hnsw_ef values (0 = default)")
+    parser.add_argument("--oversampling", type=float, default=2.0, help="Oversampling used with rescoring")
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the question set per setting")
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    args = parser.parse_args()
+
+    collection = args.collection or get_settings().qdrant_collection
+    client = get_qdrant_client()
+    questions = _load_questions(client, collection, args.questions, args.sample)
+    if not questions:
+        raise SystemExit(f"No questions available for '{collection}'")
+    rescore_options: List[Optional[bool]] = [True, False] if _is_quantized(client, collection) else [None]
+
+    rows = run_sweep(
+        collection, questions, _int_list(args.k), _int_list(args.ef), rescore_options, args.oversampling, args.repeats
+    )
+    print(f"collection={collection} questions={len(questions)} repeats={args.repeats}")
+    print(f"{'k':>4} {'ef':>8} {'rescore':>8} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'qps':>8}")
+    for r in rows:
+        print(
+            f"{r['k']:>4} {str(r['ef']):>8} {str(r['rescore']):>8} {r['recall']:>9.3f} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['qps']:>8.1f}"
+        )
+
+    # Per k, the fastest (lowest p95) setting that meets the recall target
+    print(f"\nFastest settings with recall@k >= {args.target_recall}:")
+    for k in _int_list(args.k):
+        ok = [r for r in rows if r["k"] == k and r["recall"] >= args.target_recall]
+        if not ok:
+            print(f"  k={k}: none; raise --ef or enable rescoring")
+            continue
+        best = min(ok, key=lambda r: r["p95_ms"])
+        print(
+            f"  k={k}: RAG_SEARCH_K={k} RAG_HNSW_EF={0 if best['ef'] == 'default' else best['ef']}"
+            + ("" if best["rescore"] == "-" else f" RAG_QUANTIZATION_RESCORE={str(best['rescore']).lower()}")
+            + (f" RAG_QUANTIZATION_OVERSAMPLING={args.oversampling}" if best["rescore"] is True else "")
+            + f"  (recall {best['recall']:.3f}, p95 {best['p95_ms']:.2f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Build a larger gazetteer TSV from a GeoNames dump (https://download.geonames.org/export/dump/),
+e.g. cities15000.txt, then point WEATHER_GAZETTEER_PATH at the output.
+
+    python scripts/build_gazetteer.py --geonames cities15000.txt --out data/gazetteer.tsv
+"""
+
+import argparse
+import re
+
+
+_LATIN = re.compile(r"^[A-Za-zÀ-ɏ .'\-]+$")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--geonames", required=True, help="GeoNames cities*.txt file")
+    parser.add_argument("--out", required=True, help="Output TSV path")
+    parser.add_argument("--min-population", type=int, default=15000)
+    parser.add_argument("--max-aliases", type=int, default=8)
+    args = parser.parse_args()
+
+    rows = []
+    with open(args.geonames, "r", encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 15:
+                continue
+            population = int(cols[14] or 0)
+            if population < args.min_population:
+                continue
+            name, ascii_name, alternates = cols[1], cols[2], cols[3]
+            aliases = []
+            for alias in [ascii_name, *alternates.split(",")]:
+                alias = alias.strip()
+                # Latin-script aliases only, and no short codes that would match ordinary words
+                if alias and alias != name and len(alias) > 3 and _LATIN.match(alias) and alias not in aliases:
+                    aliases.append(alias)
+            rows.append((population, name, cols[8], cols[4], cols[5], aliases[: args.max_aliases]))
+
+    # Larger cities first: the gazetteer resolves ambiguous names to the earliest entry
+    rows.sort(key=lambda r: r[0], reverse=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write("# name\tcountry\tlat\tlon\taliases (|-separated)\n")
+        for _, name, country, lat, lon, aliases in rows:
+            f.write(f"{name}\t{country}\t{float(lat):.2f}\t{float(lon):.2f}\t{'|'.join(aliases)}\n")
+    print(f"Wrote {len(rows)} places to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,48 @@
 import argparse
 
-from src.rag import ingest_pdf_into_qdrant
+from src.config import get_settings
+from src.jobs import DONE, IngestJobManager, get_job_manager
 
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--pdf", required=True, help="Path to PDF file")
+    parser.add_argument("--pdf", action="append", help="Path to PDF file (repeat to queue several)")
     parser.add_argument("--collection", default=None, help="Qdrant collection name")
+    parser.add_argument("--status", action="store_true", help="List recent ingestion jobs and exit")
     args = parser.parse_args()
 
-    res = ingest_pdf_into_qdrant(args.pdf, args.collection)
-    print(f"Ingested {res['num_chunks']} chunks into collection '{res['collection']}'.")
+    if args.status:
+        # Read-only: never recovers or runs jobs owned by the UI/service
+        manager = IngestJobManager(get_settings().ingest_jobs_db, read_only=True)
+        for job in manager.list_jobs():
+            print(
+                f"{job['id']} {job['status']:<8} pages={job['pages_processed']} "
+                f"chunks={job['chunks_processed']}/{job['total_chunks'] or '?'} {job['path']}"
+            )
+        manager.shutdown()
+        return
+    if not args.pdf:
+        parser.error("--pdf is required unless --status is given")
+
+    # Jobs run in this process's worker pool (INGEST_MAX_CONCURRENT_JOBS); wait for each to finish
+    manager = get_job_manager()
+    job_ids = [manager.submit(path, args.collection) for path in args.pdf]
+    failed = False
+    for job_id in job_ids:
+        job = manager.wait(job_id)
+        if job.get("status") == DONE:
+            rate = job.get("chunks_per_second") or 0.0
+            print(
+                f"Ingested {job['chunks_processed']} chunks from {job['pages_processed']} pages "
+                f"into collection '{job['collection']}' ({rate:.1f} chunks/s)."
+            )
+        else:
+            failed = True
+            print(f"Failed to ingest {job.get('path')}: {job.get('error')}")
+    manager.shutdown()
+    if failed:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
     main()
-
-
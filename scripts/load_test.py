@@ -0,0 +1,127 @@
+"""
+Closed-loop load test for the HTTP service (`src/service.py`).
+
+By default it starts the service in-process on a free port with a stand-in
+graph that sleeps for --standin-latency-ms instead of calling Qdrant/LLM/
+OpenWeather, so the numbers reflect service overhead and concurrency limits.
+Pass --url to target a real running service instead.
+
+Example:
+    python scripts/load_test.py --concurrency 32 --duration 20
+    python scripts/load_test.py --url http://127.0.0.1:8000 --question "Summarize section 2"
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+
+class StandInGraph:
+    """Mimics the compiled graph's async API with a fixed simulated latency."""
+
+    def __init__(self, latency_s: float) -> None:
+        self._latency_s = latency_s
+
+    async def ainvoke(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        await asyncio.sleep(self._latency_s)
+        return {"answer": f"stand-in answer to: {state.get('question', '')}", "route": "rag", "sources": []}
+
+    async def astream(self, state: Dict[str, Any], stream_mode: str = "updates"):
+        yield {"rag": await self.ainvoke(state)}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_standin_server(latency_s: float) -> str:
+    import uvicorn
+
+    from src.service import create_app
+
+    port = _free_port()
+    config = uvicorn.Config(create_app(graph=StandInGraph(latency_s)), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/healthz", timeout=1).status_code == 200:
+                return url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("Stand-in service did not start")
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+async def _run(url: str, question: str, concurrency: int, duration_s: float, timeout_s: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    stop_at = time.perf_counter() + duration_s
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout_s, limits=limits) as client:
+
+        async def worker() -> None:
+            while time.perf_counter() < stop_at:
+                started = time.perf_counter()
+                try:
+                    resp = await client.post("/ask", json={"question": question})
+                    if resp.status_code == 200:
+                        latencies.append(time.perf_counter() - started)
+                    else:
+                        errors[str(resp.status_code)] = errors.get(str(resp.status_code), 0) + 1
+                except httpx.HTTPError as exc:
+                    errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="Target service URL (default: start a local stand-in)")
+    parser.add_argument("--question", default="What is the document about?")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to sustain load")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request client timeout (s)")
+    parser.add_argument("--standin-latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    url = args.url or _start_standin_server(args.standin_latency_ms / 1000.0)
+    res = asyncio.run(_run(url, args.question, args.concurrency, args.duration, args.timeout))
+    lat_ms = [v * 1000 for v in res["latencies"]]
+    ok = len(lat_ms)
+    print(f"target={url} concurrency={args.concurrency} duration={res['elapsed']:.1f}s")
+    print(f"ok={ok} errors={sum(res['errors'].values())} {res['errors'] or ''}")
+    print(f"sustained_qps={ok / res['elapsed']:.1f}")
+    if lat_ms:
+        print(
+            f"latency_ms p50={_percentile(lat_ms, 50):.1f} p90={_percentile(lat_ms, 90):.1f} "
+            f"p95={_percentile(lat_ms, 95):.1f} p99={_percentile(lat_ms, 99):.1f} "
+            f"mean={statistics.fmean(lat_ms):.1f} max={max(lat_ms):.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
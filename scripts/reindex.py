@@ -0,0 +1,48 @@
+"""
+Re-embed a collection from the local chunk store into a shadow collection and
+switch the Qdrant alias to it. Set the new embeddings provider/model in the
+environment (EMBEDDINGS_PROVIDER, GOOGLE_EMBEDDINGS_MODEL, ...) before running.
+
+    python scripts/reindex.py --alias pdf_documents
+"""
+
+import argparse
+
+from src.config import get_settings
+from src.reindex import reindex_collection
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alias", default=None, help="Alias queried by the app (default: QDRANT_COLLECTION)")
+    parser.add_argument("--target", default=None, help="Name for the new collection (default: <alias>_<timestamp>)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--drop-old", action="store_true", help="Delete the previous collection after switching")
+    parser.add_argument(
+        "--adopt-legacy",
+        action="store_true",
+        help="Allow replacing a plain collection named --alias with an alias (drops points not in the chunk store)",
+    )
+    args = parser.parse_args()
+
+    alias = args.alias or get_settings().qdrant_collection
+
+    def progress(done: int, total: int) -> None:
+        print(f"  re-embedded {done}/{total} chunks", end="\r", flush=True)
+
+    res = reindex_collection(
+        alias,
+        target=args.target,
+        batch_size=args.batch_size,
+        drop_old=args.drop_old,
+        adopt_legacy=args.adopt_legacy,
+        progress=progress,
+    )
+    print(
+        f"\nAlias '{res['alias']}' now points to '{res['collection']}' "
+        f"({res['num_chunks']} chunks, dim {res['dimension']}); previous: {res['previous'] or 'plain collection'}."
+    )
+
+
+if __name__ == "__main__":
+    main()
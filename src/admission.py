@@ -0,0 +1,277 @@
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    from src.config import get_settings
+except Exception:
+    from config import get_settings
+
+
+class BackendBusy(RuntimeError):
+    """Raised instead of queueing when a backend cannot take the call before its deadline."""
+
+    def __init__(self, backend: str, retry_after: float, reason: str) -> None:
+        super().__init__(f"{backend} is busy ({reason}); retry in {retry_after:.1f}s")
+        self.backend = backend
+        self.retry_after = retry_after
+
+
+# Absolute monotonic deadline of the request being served (see `deadline_scope`)
+_DEADLINE: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("admission_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[None]:
+    """Cap how long backend calls made inside this block (and its copied contexts) may queue."""
+    token = _DEADLINE.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def wait_while_busy(fn: Callable[[], Any], max_wait_s: Optional[float] = None) -> Any:
+    """Run `fn()`, sleeping out `BackendBusy` and retrying for up to `max_wait_s` in total.
+
+    For background work (ingest jobs) that should queue behind interactive
+    traffic instead of failing; defaults to INGEST_BUSY_MAX_WAIT_S.
+    """
+    if max_wait_s is None:
+        max_wait_s = get_settings().ingest_busy_max_wait_s
+    give_up = time.monotonic() + max_wait_s
+    while True:
+        try:
+            return fn()
+        except BackendBusy as exc:
+            pause = max(0.1, exc.retry_after) * random.uniform(1.0, 1.5)
+            if time.monotonic() + pause > give_up:
+                raise
+            time.sleep(pause)
+
+
+def submit_in_context(pool: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    """`pool.submit` that runs `fn` in a copy of the caller's context, so its `deadline_scope` still applies."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def map_in_context(pool: Executor, fn: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Any]:
+    """`pool.map` counterpart of `submit_in_context` (one context copy per item)."""
+    futures = [submit_in_context(pool, fn, item) for item in items]
+    return (future.result() for future in futures)
+
+
+def _parse_retry_after(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limit_delay(exc: BaseException) -> Optional[float]:
+    """Seconds to back off if `exc` is a rate-limit/overload error (0 = no hint), else None.
+
+    Understands requests/huggingface_hub HTTP errors (`exc.response`) and Google API
+    errors (`exc.code == 429`).
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) or getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if status not in (429, 503) and type(exc).__name__ not in ("ResourceExhausted", "TooManyRequests", "RateLimitError"):
+        return None
+    headers = getattr(response, "headers", None)
+    hint = _parse_retry_after(headers.get("Retry-After")) if hasattr(headers, "get") else None
+    return hint if hint is not None else 0.0
+
+
+class TokenBucket:
+    """Rate limiter handing out reservations: callers sleep until their token is due."""
+
+    def __init__(self, rate_per_s: float, burst: int) -> None:
+        self.rate = rate_per_s
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, deadline: float) -> Optional[float]:
+        """Reserve one token; return the wait before using it, or None if it is not due before `deadline`."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1.0 - self._tokens) / self.rate)
+            if now + wait > deadline:
+                return None
+            self._tokens -= 1.0
+            return wait
+
+
+class Backend:
+    """Admission control for one upstream (OpenWeather, an LLM provider, embeddings, Qdrant).
+
+    A call waits, in order, for any Retry-After pause, a rate token and a
+    concurrency slot, all bounded by the call's deadline (the backend queue
+    timeout or the enclosing `deadline_scope`, whichever is sooner). When
+    `max_queue` callers are already waiting, or the wait cannot finish before
+    the deadline, `BackendBusy` is raised immediately instead. Rate-limit
+    errors (429/503) pause the whole backend for the advertised Retry-After
+    (or an exponential backoff) and are retried up to `max_retries` times.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_s: float = 0.0,
+        burst: int = 1,
+        max_concurrency: int = 0,
+        max_queue: int = 64,
+        queue_timeout_s: float = 10.0,
+        max_retries: int = 3,
+        max_backoff_s: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.max_retries = max_retries
+        self.max_backoff_s = max_backoff_s
+        self._bucket = TokenBucket(rate_per_s, burst)
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self.waiting = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.shed = 0
+        self.rate_limited = 0
+
+    def _busy(self, retry_after: float, reason: str) -> BackendBusy:
+        with self._lock:
+            self.shed += 1
+        return BackendBusy(self.name, retry_after, reason)
+
+    def _admit(self, deadline: float) -> None:
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                self.shed += 1
+                raise BackendBusy(self.name, 1.0, "queue full")
+            self.waiting += 1
+        try:
+            pause = self._resume_at - time.monotonic()
+            if pause > 0:
+                if time.monotonic() + pause > deadline:
+                    raise self._busy(pause, "rate limited upstream")
+                time.sleep(pause)
+            wait = self._bucket.reserve(deadline)
+            if wait is None:
+                raise self._busy(1.0 / self._bucket.rate, "rate limit")
+            if wait > 0:
+                time.sleep(wait)
+            if self._slots is not None and not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                raise self._busy(1.0, "concurrency limit")
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+    def _backoff(self, exc: BaseException, attempt: int) -> Optional[float]:
+        delay = rate_limit_delay(exc)
+        if delay is None or attempt >= self.max_retries:
+            return None
+        if delay <= 0:
+            delay = random.uniform(0.5, 1.0) * min(self.max_backoff_s, 0.5 * 2 ** attempt)
+        delay = min(delay, self.max_backoff_s)
+        with self._lock:
+            self.rate_limited += 1
+            # Everyone queued on this backend waits out the pause, not just this caller
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+        return delay
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        deadline = time.monotonic() + self.queue_timeout_s
+        ambient = _DEADLINE.get()
+        if ambient is not None:
+            deadline = min(deadline, ambient)
+        attempt = 0
+        while True:
+            self._admit(deadline)
+            with self._lock:
+                self.calls += 1
+                self.in_flight += 1
+            try:
+                return fn()
+            except Exception as exc:
+                delay = self._backoff(exc, attempt)
+                if delay is None:
+                    raise
+                try:
+                    print(f"[admission] {self.name}: rate limited, backing off {delay:.1f}s")
+                except Exception:
+                    pass
+                attempt += 1
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                if self._slots is not None:
+                    self._slots.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "calls": self.calls,
+                "shed": self.shed,
+                "rate_limited": self.rate_limited,
+            }
+
+
+_BACKENDS: Dict[str, Backend] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def _backend_from_settings(name: str) -> Backend:
+    # "llm:google" and "llm:hf" get separate buckets configured by the LLM_* settings
+    settings = get_settings()
+    kind = name.split(":", 1)[0]
+    return Backend(
+        name,
+        rate_per_s=getattr(settings, f"{kind}_rate_per_s", 0.0),
+        burst=getattr(settings, f"{kind}_burst", 1),
+        max_concurrency=getattr(settings, f"{kind}_max_concurrency", 0),
+        max_queue=settings.admission_max_queue,
+        queue_timeout_s=settings.admission_queue_timeout_s,
+        max_retries=settings.admission_max_retries,
+        max_backoff_s=settings.admission_max_backoff_s,
+    )
+
+
+def get_backend(name: str) -> Backend:
+    with _BACKENDS_LOCK:
+        backend = _BACKENDS.get(name)
+        if backend is None:
+            backend = _BACKENDS[name] = _backend_from_settings(name)
+    return backend
+
+
+def admit(name: str, fn: Callable[[], Any]) -> Any:
+    """Run `fn()` under the admission control of backend `name`."""
+    return get_backend(name).call(fn)
+
+
+def backend_stats() -> Dict[str, Dict[str, Any]]:
+    with _BACKENDS_LOCK:
+        backends = dict(_BACKENDS)
+    return {name: backend.snapshot() for name, backend in backends.items()}
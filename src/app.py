@@ -1,7 +1,8 @@
 import os
 import sys
-import io
-from typing import Dict
+import hashlib
+import tempfile
+from typing import Any, Dict, Tuple
 
 import streamlit as st
 
@@ -10,8 +11,14 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from src.admission import BackendBusy
+from src.config import get_settings
 from src.graph import build_graph
-from src.rag import ingest_pdf_into_qdrant
+from src.jobs import DONE, FAILED, RUNNING, get_job_manager
+
+
+UPLOAD_DIR = os.path.join(PROJECT_ROOT, "data", "uploads")
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 st.set_page_config(page_title="AI Pipeline: Weather + RAG", page_icon="⛅")
@@ -21,6 +28,94 @@ if "graph" not in st.session_state:
     st.session_state.graph = build_graph()
 
 
+def _save_upload(uploaded) -> Tuple[str, str]:
+    """Stream an upload to its own temp file in chunks; return (path, sha256)."""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    hasher = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(suffix=".pdf.part", dir=UPLOAD_DIR)
+    try:
+        uploaded.seek(0)
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = uploaded.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                f.write(chunk)
+        digest = hasher.hexdigest()
+        # Content-addressed final name: identical uploads map to the same file
+        final_path = os.path.join(UPLOAD_DIR, f"{digest}.pdf")
+        os.replace(tmp_path, final_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return final_path, digest
+
+
+def _upload_key(uploaded) -> str:
+    return getattr(uploaded, "file_id", None) or f"{uploaded.name}:{uploaded.size}"
+
+
+def _submit_upload_once(uploaded, retry: bool = False) -> str:
+    """Queue an ingest job for an upload, at most once per content hash and collection.
+
+    Reruns of the same upload in this session skip re-reading the file; the job
+    table dedupes identical bytes across sessions and restarts. A failed job is
+    only resubmitted when `retry` is set (the "Retry ingestion" button), never
+    implicitly on a rerun.
+    """
+    upload_key = _upload_key(uploaded)
+    jobs: Dict[str, str] = st.session_state.setdefault("upload_jobs", {})
+    manager = get_job_manager()
+    job_id = jobs.get(upload_key)
+    if job_id is not None:
+        job = manager.get_job(job_id)
+        if job is not None and not (retry and job["status"] == FAILED):
+            return job_id
+
+    path, digest = _save_upload(uploaded)
+    job_id = manager.submit(path, get_settings().qdrant_collection, dedupe_key=digest)
+    jobs[upload_key] = job_id
+    return job_id
+
+
+def _render_job(job: Dict[str, Any]) -> None:
+    status = job["status"]
+    total = job.get("total_chunks")
+    done = job.get("chunks_processed") or 0
+    rate = job.get("chunks_per_second")
+    if status == DONE:
+        st.success(f"Ingested {done} chunks into '{job['collection']}'")
+    elif status == FAILED:
+        st.error(
+            "Failed to ingest PDF into Qdrant Cloud. Verify QDRANT_URL and QDRANT_API_KEY in your environment.\n\n"
+            f"Details: {job.get('error')}"
+        )
+    elif status == RUNNING and total:
+        label = f"Embedding chunks {done}/{total}" + (f" ({rate:.1f} chunks/s)" if rate else "")
+        st.progress(min(done / total, 1.0), text=label)
+    elif status == RUNNING:
+        st.info(f"Parsing PDF: {job.get('pages_processed') or 0} pages read")
+    else:
+        st.info("Queued for ingestion...")
+
+
+def _job_panel() -> None:
+    manager = get_job_manager()
+    for job_id in st.session_state.get("upload_jobs", {}).values():
+        job = manager.get_job(job_id)
+        if job is not None:
+            _render_job(job)
+
+
+# Poll job progress without rerunning the whole page when the Streamlit version supports fragments
+if hasattr(st, "fragment"):
+    _job_panel = st.fragment(run_every=1.0)(_job_panel)
+
+
 with st.sidebar:
     st.header("PDF Ingestion")
     if st.button("Reset graph"):
@@ -30,18 +125,15 @@ with st.sidebar:
         st.success("Graph reset.")
     uploaded = st.file_uploader("Upload a PDF to index", type=["pdf"]) 
     if uploaded is not None:
-        bytes_data = uploaded.read()
-        tmp_path = "./data/_uploaded.pdf"
-        with open(tmp_path, "wb") as f:
-            f.write(bytes_data)
         try:
-            res = ingest_pdf_into_qdrant(tmp_path)
-            st.success(f"Ingested {res['num_chunks']} chunks into '{res['collection']}'")
+            job = get_job_manager().get_job(_submit_upload_once(uploaded))
+            if job is not None and job["status"] == FAILED and st.button("Retry ingestion"):
+                _submit_upload_once(uploaded, retry=True)
         except Exception as exc:
-            st.error(
-                "Failed to ingest PDF into Qdrant Cloud. Verify QDRANT_URL and QDRANT_API_KEY in your environment.\n\n"
-                f"Details: {exc}"
-            )
+            st.error(f"Failed to queue PDF for ingestion. Details: {exc}")
+    _job_panel()
+    if not hasattr(st, "fragment") and st.button("Refresh progress"):
+        st.rerun()
 
 st.write("Ask about weather (e.g., 'What's the weather in Paris?') or your PDF (e.g., 'Summarize section 2').")
 
@@ -62,7 +154,11 @@ if st.button("Ask") and user_input.strip():
                 return loop.run_until_complete(graph.ainvoke(payload))
             raise
 
-    result: Dict | None = _invoke_graph_safely(st.session_state.graph, {"question": user_input.strip()})
+    try:
+        result: Dict | None = _invoke_graph_safely(st.session_state.graph, {"question": user_input.strip()})
+    except BackendBusy as exc:
+        st.warning(f"The {exc.backend} backend is busy right now; please retry in {max(1, round(exc.retry_after))}s.")
+        st.stop()
     if not isinstance(result, dict):
         st.error("Unexpected empty result from graph. Please try again.")
     else:
@@ -0,0 +1,115 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    from src.config import get_settings
+except Exception:
+    from config import get_settings
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS chunks ("
+    " id TEXT NOT NULL, collection TEXT NOT NULL, file_sha256 TEXT, chunk_index INTEGER NOT NULL,"
+    " payload BLOB NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (collection, id))",
+    "CREATE INDEX IF NOT EXISTS chunks_by_file ON chunks (collection, file_sha256)",
+)
+
+
+def _pack(text: str, metadata: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps({"t": text, "m": metadata}, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> Tuple[str, Dict[str, Any]]:
+    data = json.loads(zlib.decompress(blob).decode("utf-8"))
+    return data["t"], data["m"]
+
+
+class ChunkStore:
+    """Local copy of every ingested chunk (text + metadata, zlib-compressed) keyed by point id.
+
+    Lets a collection be re-embedded with a different model without the source PDFs.
+    Chunks are grouped by the logical collection name used at ingest (an alias after
+    the first reindex).
+    """
+
+    def __init__(self, db_path: str) -> None:
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+        self._conn.commit()
+
+    def replace_file(
+        self, collection: str, file_hash: str, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Store a file's chunks, replacing any earlier chunking; returns ids that were dropped."""
+        now = time.time()
+        with self._lock:
+            previous = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM chunks WHERE collection = ? AND file_sha256 = ?", (collection, file_hash)
+                )
+            }
+            self._conn.execute("DELETE FROM chunks WHERE collection = ? AND file_sha256 = ?", (collection, file_hash))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunks (id, collection, file_sha256, chunk_index, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (chunk_id, collection, file_hash, i, _pack(text, meta), now)
+                    for i, (chunk_id, text, meta) in enumerate(zip(ids, texts, metadatas))
+                ],
+            )
+            self._conn.commit()
+        return sorted(previous - set(ids))
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks WHERE collection = ?", (collection,)).fetchone()[0]
+
+    def ids(self, collection: str) -> Set[str]:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT id FROM chunks WHERE collection = ?", (collection,))}
+
+    def iter_batches(
+        self, collection: str, batch_size: int = 64, since: Optional[float] = None
+    ) -> Iterator[List[Tuple[str, str, Dict[str, Any]]]]:
+        """Yield `(id, text, metadata)` batches in insertion order using keyset pagination.
+
+        With `since`, only chunks stored at or after that `time.time()` value are returned.
+        """
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, id, payload FROM chunks WHERE collection = ? AND rowid > ? AND created_at >= ? "
+                    "ORDER BY rowid LIMIT ?",
+                    (collection, last_rowid, since or 0.0, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            yield [(chunk_id, *_unpack(payload)) for _, chunk_id, payload in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_CHUNK_STORE: ChunkStore | None = None
+_CHUNK_STORE_LOCK = threading.Lock()
+
+
+def get_chunk_store() -> ChunkStore:
+    global _CHUNK_STORE
+    with _CHUNK_STORE_LOCK:
+        if _CHUNK_STORE is None:
+            _CHUNK_STORE = ChunkStore(get_settings().chunk_store_db)
+    return _CHUNK_STORE
@@ -14,12 +14,77 @@ class Settings:
     google_api_key: str = os.getenv("GOOGLE_API_KEY", "")
     google_llm_model: str = os.getenv("GOOGLE_LLM_MODEL", "gemini-1.5-flash")
 
+    # Provider routing (hedging + failover) across configured LLM / embeddings providers
+    provider_routing: str = os.getenv("PROVIDER_ROUTING", "false")
+    llm_providers: str = os.getenv("LLM_PROVIDERS", "")
+    provider_hedge_after_s: float = float(os.getenv("PROVIDER_HEDGE_AFTER_S", "3"))
+    provider_hedge_min_samples: int = int(os.getenv("PROVIDER_HEDGE_MIN_SAMPLES", "20"))
+    provider_breaker_failures: int = int(os.getenv("PROVIDER_BREAKER_FAILURES", "3"))
+    provider_breaker_cooldown_s: float = float(os.getenv("PROVIDER_BREAKER_COOLDOWN_S", "30"))
+    provider_max_workers: int = int(os.getenv("PROVIDER_MAX_WORKERS", "32"))
+
+    # Admission control per backend (weather, llm, embeddings, qdrant); rate 0 = unlimited
+    admission_queue_timeout_s: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_S", "10"))
+    admission_max_queue: int = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+    admission_max_retries: int = int(os.getenv("ADMISSION_MAX_RETRIES", "3"))
+    admission_max_backoff_s: float = float(os.getenv("ADMISSION_MAX_BACKOFF_S", "30"))
+    ingest_busy_max_wait_s: float = float(os.getenv("INGEST_BUSY_MAX_WAIT_S", "600"))
+    weather_rate_per_s: float = float(os.getenv("WEATHER_RATE_PER_S", "0"))
+    weather_burst: int = int(os.getenv("WEATHER_BURST", "10"))
+    llm_rate_per_s: float = float(os.getenv("LLM_RATE_PER_S", "0"))
+    llm_burst: int = int(os.getenv("LLM_BURST", "5"))
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    embeddings_rate_per_s: float = float(os.getenv("EMBEDDINGS_RATE_PER_S", "0"))
+    embeddings_burst: int = int(os.getenv("EMBEDDINGS_BURST", "10"))
+    embeddings_max_concurrency: int = int(os.getenv("EMBEDDINGS_MAX_CONCURRENCY", "8"))
+    qdrant_rate_per_s: float = float(os.getenv("QDRANT_RATE_PER_S", "0"))
+    qdrant_burst: int = int(os.getenv("QDRANT_BURST", "50"))
+    qdrant_max_concurrency: int = int(os.getenv("QDRANT_MAX_CONCURRENCY", "32"))
+
     openweather_api_key: str = os.getenv("OPENWEATHER_API_KEY", "")
+    weather_max_concurrency: int = int(os.getenv("WEATHER_MAX_CONCURRENCY", "8"))
+    weather_cache_ttl_s: float = float(os.getenv("WEATHER_CACHE_TTL_S", "300"))
+    weather_cache_max_entries: int = int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "1024"))
+    weather_gazetteer_path: str = os.getenv("WEATHER_GAZETTEER_PATH", "")
 
     qdrant_url: str = os.getenv("QDRANT_URL", "http://localhost:6333")
     qdrant_api_key: str = os.getenv("QDRANT_API_KEY", "")
     qdrant_collection: str = os.getenv("QDRANT_COLLECTION", "pdf_documents")
 
+    # Retrieval knobs; pick values with scripts/benchmark_retrieval.py (0/empty = Qdrant default)
+    rag_search_k: int = int(os.getenv("RAG_SEARCH_K", "4"))
+    rag_hnsw_ef: int = int(os.getenv("RAG_HNSW_EF", "0"))
+    rag_quantization_rescore: str = os.getenv("RAG_QUANTIZATION_RESCORE", "")
+    rag_quantization_oversampling: float = float(os.getenv("RAG_QUANTIZATION_OVERSAMPLING", "0"))
+    # Answer "summarize ..." questions from precomputed summary nodes when they exist (empty: follow INGEST_SUMMARIES)
+    rag_summary_mode: str = os.getenv("RAG_SUMMARY_MODE", "")
+
+    ingest_max_concurrent_jobs: int = int(os.getenv("INGEST_MAX_CONCURRENT_JOBS", "1"))
+    ingest_jobs_db: str = os.getenv("INGEST_JOBS_DB", "data/ingest_jobs.sqlite3")
+
+    pdf_parser: str = os.getenv("PDF_PARSER", "auto")
+    pdf_parse_workers: int = int(os.getenv("PDF_PARSE_WORKERS", "0"))
+    pdf_page_cache_db: str = os.getenv("PDF_PAGE_CACHE_DB", "data/page_cache.sqlite3")
+
+    chunk_store_db: str = os.getenv("CHUNK_STORE_DB", "data/chunk_store.sqlite3")
+
+    # Optional ingest stage: page/section/document summaries stored as extra vector store nodes
+    ingest_summaries: str = os.getenv("INGEST_SUMMARIES", "false")
+    summary_levels: str = os.getenv("SUMMARY_LEVELS", "page,section,document")
+    summary_max_input_chars: int = int(os.getenv("SUMMARY_MAX_INPUT_CHARS", "12000"))
+    summary_workers: int = int(os.getenv("SUMMARY_WORKERS", "4"))
+    summary_pages_per_section: int = int(os.getenv("SUMMARY_PAGES_PER_SECTION", "5"))
+    # Cosine similarity a summary needs to answer a question that names no page or section
+    summary_min_score: float = float(os.getenv("SUMMARY_MIN_SCORE", "0.5"))
+
+    startup_prewarm: str = os.getenv("STARTUP_PREWARM", "false")
+
+    service_max_concurrency: int = int(os.getenv("SERVICE_MAX_CONCURRENCY", "16"))
+    service_queue_timeout_s: float = float(os.getenv("SERVICE_QUEUE_TIMEOUT_S", "5"))
+    service_request_timeout_s: float = float(os.getenv("SERVICE_REQUEST_TIMEOUT_S", "60"))
+    # POST /ingest only accepts PDFs under this directory
+    service_ingest_dir: str = os.getenv("SERVICE_INGEST_DIR", "data/uploads")
+
     langsmith_tracing: str = os.getenv("LANGSMITH_TRACING", "false")
     langsmith_api_key: str = os.getenv("LANGSMITH_API_KEY", "")
     langsmith_project: str = os.getenv("LANGSMITH_PROJECT", "ai-pipeline-assignment")
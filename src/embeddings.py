@@ -1,15 +1,14 @@
 import os
+import threading
+
+from langchain_core.embeddings import Embeddings
 
 # Avoid importing TensorFlow/Keras paths inside transformers
 os.environ.setdefault("TRANSFORMERS_NO_TF", "1")
 os.environ.setdefault("USE_TF", "0")
 
-from langchain_huggingface import HuggingFaceEndpointEmbeddings
-
-try:
-    from langchain_google_genai import GoogleGenerativeAIEmbeddings
-except Exception:
-    GoogleGenerativeAIEmbeddings = None  # type: ignore
+# Provider SDKs are imported inside `build_embeddings` on the branch that needs them,
+# so importing this module (and the graph) stays cheap until embeddings are built.
 
 
 def build_embeddings(model_name: str = "BAAI/bge-small-en-v1.5"):
@@ -30,10 +29,12 @@ def build_embeddings(model_name: str = "BAAI/bge-small-en-v1.5"):
     embeddings_provider = os.getenv("EMBEDDINGS_PROVIDER", "").strip().lower()
     google_api_key = os.getenv("GOOGLE_API_KEY", "").strip()
     if embeddings_provider == "google" or (google_api_key and embeddings_provider != "local"):
-        if GoogleGenerativeAIEmbeddings is None:
+        try:
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        except Exception as exc:
             raise RuntimeError(
                 "langchain-google-genai is not installed. Add it to requirements.txt and pip install."
-            )
+            ) from exc
         if not google_api_key:
             raise RuntimeError("GOOGLE_API_KEY is required for Google embeddings")
         google_emb_model = os.getenv("GOOGLE_EMBEDDINGS_MODEL", "text-embedding-004")
@@ -42,17 +43,13 @@ def build_embeddings(model_name: str = "BAAI/bge-small-en-v1.5"):
     # Allow forcing local backend via env var to avoid HF auth entirely
     backend_override = os.getenv("EMBEDDINGS_BACKEND", "").strip().lower()
     if backend_override == "local":
-        from langchain_community.embeddings import HuggingFaceEmbeddings
-        device = os.getenv("EMBEDDINGS_DEVICE", "cpu")
-        return HuggingFaceEmbeddings(
-            model_name=model_name,
-            model_kwargs={"device": device},
-            encode_kwargs={"normalize_embeddings": True},
-        )
+        return _build_local_embeddings(model_name)
 
     # Try remote Inference API first when a token is present
     if getattr(settings, "huggingface_api_key", None):
         try:
+            from langchain_huggingface import HuggingFaceEndpointEmbeddings
+
             hf = HuggingFaceEndpointEmbeddings(
                 repo_id=model_name,
                 huggingfacehub_api_token=settings.huggingface_api_key,
@@ -68,6 +65,10 @@ def build_embeddings(model_name: str = "BAAI/bge-small-en-v1.5"):
             pass
 
     # Fallback: local embeddings using sentence-transformers (force CPU to avoid meta tensor issues)
+    return _build_local_embeddings(model_name)
+
+
+def _build_local_embeddings(model_name: str):
     try:
         from langchain_community.embeddings import HuggingFaceEmbeddings
     except Exception as exc:
@@ -85,3 +86,96 @@ def build_embeddings(model_name: str = "BAAI/bge-small-en-v1.5"):
     )
 
 
+class RoutedEmbeddings(Embeddings):
+    """Embeddings that dispatch through a `ProviderRouter` (hedging + failover).
+
+    Only providers serving the same model are routed between, so vectors stay
+    comparable: the HF Inference endpoint and the local sentence-transformers copy.
+    """
+
+    def __init__(self, router) -> None:
+        self._router = router
+
+    def embed_documents(self, texts):
+        return self._router.call(lambda emb: emb.embed_documents(texts))[0]
+
+    def embed_query(self, text):
+        return self._router.call(lambda emb: emb.embed_query(text))[0]
+
+    def provider_stats(self):
+        return self._router.stats()
+
+
+def _routed_embedding_providers(model_name: str):
+    """(name, factory) pairs that produce `model_name` vectors; empty when Google embeddings are selected."""
+    try:
+        from src.config import get_settings
+    except Exception:
+        from config import get_settings
+
+    embeddings_provider = os.getenv("EMBEDDINGS_PROVIDER", "").strip().lower()
+    google_api_key = os.getenv("GOOGLE_API_KEY", "").strip()
+    if embeddings_provider == "google" or (google_api_key and embeddings_provider != "local"):
+        return []
+    if os.getenv("EMBEDDINGS_BACKEND", "").strip().lower() == "local":
+        return []
+    token = get_settings().huggingface_api_key
+    if not token:
+        return []
+
+    def _hf():
+        from langchain_huggingface import HuggingFaceEndpointEmbeddings
+
+        return HuggingFaceEndpointEmbeddings(repo_id=model_name, huggingfacehub_api_token=token)
+
+    return [("hf", _hf), ("local", lambda: _build_local_embeddings(model_name))]
+
+
+class AdmittedEmbeddings(Embeddings):
+    """Embeddings whose calls go through the "embeddings" admission backend (rate, concurrency, 429 backoff)."""
+
+    def __init__(self, inner) -> None:
+        self._inner = inner
+
+    def embed_documents(self, texts):
+        return _admit("embeddings", lambda: self._inner.embed_documents(texts))
+
+    def embed_query(self, text):
+        return _admit("embeddings", lambda: self._inner.embed_query(text))
+
+
+def _admit(backend, fn):
+    try:
+        from src.admission import admit
+    except Exception:
+        from admission import admit
+    return admit(backend, fn)
+
+
+_CACHED_EMBEDDINGS = None
+_EMBEDDINGS_LOCK = threading.Lock()
+
+
+def get_embeddings():
+    """Return a process-wide embeddings instance, built on first use.
+
+    Long-lived callers (the HTTP service, ingestion workers) share one client
+    instead of rebuilding and re-validating it on every request. With
+    PROVIDER_ROUTING=true this wraps a `RoutedEmbeddings` when a same-model
+    alternate exists. Calls are admission-controlled (`AdmittedEmbeddings`).
+    """
+    global _CACHED_EMBEDDINGS
+    with _EMBEDDINGS_LOCK:
+        if _CACHED_EMBEDDINGS is None:
+            try:
+                from src.providers import Provider, ProviderRouter, routing_enabled
+            except Exception:
+                from providers import Provider, ProviderRouter, routing_enabled
+
+            providers = _routed_embedding_providers("BAAI/bge-small-en-v1.5") if routing_enabled() else []
+            if len(providers) > 1:
+                router = ProviderRouter("embeddings", [Provider(name, factory) for name, factory in providers])
+                _CACHED_EMBEDDINGS = AdmittedEmbeddings(RoutedEmbeddings(router))
+            else:
+                _CACHED_EMBEDDINGS = AdmittedEmbeddings(build_embeddings())
+    return _CACHED_EMBEDDINGS
@@ -0,0 +1,157 @@
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from src.config import get_settings
+except Exception:
+    from config import get_settings
+
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "data", "gazetteer.tsv")
+DEFAULT_REGIONS_PATH = os.path.join(os.path.dirname(__file__), "data", "regions.tsv")
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_END = "\0"
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    country: str
+    lat: float
+    lon: float
+
+    @property
+    def key(self) -> str:
+        """Canonical identity used for caching, independent of how the user spelled the city."""
+        return f"{self.name}|{self.country}"
+
+
+def _fold(token: str) -> str:
+    # Accent- and case-insensitive: "München" and "munchen" match the same entry
+    decomposed = unicodedata.normalize("NFKD", token)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    return [_fold(t) for t in _TOKEN_RE.findall(text)]
+
+
+class Gazetteer:
+    """City names and aliases in a token trie for longest-match lookup in free text.
+
+    Entries earlier in the file win on ambiguous names, so files are ordered by
+    importance (population). Names of two characters or fewer ("LA", "NY") only
+    match when written in upper case in the question. `regions` are
+    `(country code, names)` of countries and states, used to read qualifiers
+    such as "Paris, France" or "Austin, Texas".
+    """
+
+    def __init__(
+        self, places: List[Tuple[Place, List[str]]], regions: Optional[List[Tuple[str, List[str]]]] = None
+    ) -> None:
+        self._trie: Dict[str, dict] = {}
+        self._by_name: Dict[Tuple[str, ...], Place] = {}
+        self._regions: Dict[Tuple[str, ...], str] = {}
+        for country, names in regions or []:
+            for name in names:
+                self._regions.setdefault(tuple(tokenize(name)), country)
+        for place, aliases in places:
+            for name in [place.name, *aliases]:
+                tokens = tuple(tokenize(name))
+                if not tokens or tokens in self._by_name:
+                    continue
+                self._by_name[tokens] = place
+                node = self._trie
+                for tok in tokens:
+                    node = node.setdefault(tok, {})
+                node[_END] = place
+
+    def __len__(self) -> int:
+        return len({p.key for p in self._by_name.values()})
+
+    @classmethod
+    def load(cls, path: str, regions_path: Optional[str] = DEFAULT_REGIONS_PATH) -> "Gazetteer":
+        """Load `name<TAB>country<TAB>lat<TAB>lon[<TAB>alias|alias...]` rows; `#` lines are comments.
+
+        `regions_path` rows are `country<TAB>name|name...`.
+        """
+        places: List[Tuple[Place, List[str]]] = []
+        for cols in _rows(path):
+            if len(cols) < 4:
+                continue
+            aliases = [a for a in cols[4].split("|") if a] if len(cols) > 4 else []
+            places.append((Place(cols[0], cols[1], float(cols[2]), float(cols[3])), aliases))
+        regions = [
+            (cols[0], [n for n in cols[1].split("|") if n]) for cols in (_rows(regions_path) if regions_path else [])
+            if len(cols) > 1
+        ]
+        return cls(places, regions)
+
+    def region_country(self, name: str) -> Optional[str]:
+        """Country code if `name` is a country or state name ("France", "Texas"), else None."""
+        return self._regions.get(tuple(tokenize(name)))
+
+    def lookup(self, name: str) -> Optional[Place]:
+        """Exact (case/accent-insensitive) lookup of a name or alias; accepts "City, CC" and "City, Country"."""
+        if "," in name:
+            city, _, qualifier = name.rpartition(",")
+            place = self._by_name.get(tuple(tokenize(city)))
+            qualifier = qualifier.strip()
+            if place is not None and place.country in (qualifier.upper(), self.region_country(qualifier)):
+                return place
+        return self._by_name.get(tuple(tokenize(name)))
+
+    def find_in_text(self, text: str, require_capitalized: bool = False) -> List[Place]:
+        """Return places mentioned in `text`, scanning left to right with longest match.
+
+        With `require_capitalized`, a match must start with an upper-case letter in
+        the original text (so "nice weather" does not resolve to Nice, France).
+        """
+        raw = _TOKEN_RE.findall(text)
+        tokens = [_fold(t) for t in raw]
+        found: List[Place] = []
+        i = 0
+        while i < len(tokens):
+            node = self._trie
+            best: Optional[Tuple[int, Place]] = None
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if _END in node:
+                    best = (j + 1, node[_END])
+            if best is not None and self._accept(raw[i:best[0]], require_capitalized):
+                found.append(best[1])
+                i = best[0]
+            else:
+                i += 1
+        return found
+
+    @staticmethod
+    def _accept(raw_tokens: List[str], require_capitalized: bool) -> bool:
+        if sum(len(t) for t in raw_tokens) <= 2 and not all(t.isupper() for t in raw_tokens):
+            return False
+        return not require_capitalized or raw_tokens[0][:1].isupper()
+
+
+def _rows(path: str) -> List[List[str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\r\n").split("\t") for line in f if line.strip() and not line.startswith("#")]
+
+
+_GAZETTEER: Gazetteer | None = None
+_GAZETTEER_LOCK = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Load the bundled gazetteer (or WEATHER_GAZETTEER_PATH) once per process."""
+    global _GAZETTEER
+    with _GAZETTEER_LOCK:
+        if _GAZETTEER is None:
+            _GAZETTEER = Gazetteer.load(get_settings().weather_gazetteer_path or DEFAULT_GAZETTEER_PATH)
+    return _GAZETTEER
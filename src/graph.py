@@ -1,18 +1,33 @@
 from typing import Literal, Dict, Any, TypedDict, List, Optional
 
-from langgraph.graph import StateGraph, START, END
-from langchain_core.runnables import RunnableLambda
-
 try:
+    from src.admission import BackendBusy
     from src.rag import rag_answer
-    from src.weather import fetch_weather, summarize_weather
+    from src.llm import last_provider, reset_last_provider
+    from src.weather import (
+        extract_cities,
+        fetch_weather,
+        fetch_weather_many,
+        summarize_weather,
+        summarize_weather_many,
+        template_summary,
+    )
     from src.vectorstore import get_vectorstore
-    from src.embeddings import build_embeddings
+    from src.embeddings import get_embeddings
 except Exception:  # fallback when running as a script from src/
+    from admission import BackendBusy
     from rag import rag_answer
-    from weather import fetch_weather, summarize_weather
+    from llm import last_provider, reset_last_provider
+    from weather import (
+        extract_cities,
+        fetch_weather,
+        fetch_weather_many,
+        summarize_weather,
+        summarize_weather_many,
+        template_summary,
+    )
     from vectorstore import get_vectorstore
-    from embeddings import build_embeddings
+    from embeddings import get_embeddings
 
 
 class RouterState(TypedDict, total=False):
@@ -20,6 +35,9 @@ class RouterState(TypedDict, total=False):
     answer: str
     route: str
     sources: List[Dict[str, Any]]
+    weather: List[Dict[str, Any]]
+    provider: Optional[str]
+    file_sha256: Optional[str]  # optional: scope summary questions to one ingested PDF
 
 
 def _extract_question(state: RouterState) -> str:
@@ -63,43 +81,67 @@ def weather_node(state: RouterState) -> RouterState:
             pass
 
         question = _extract_question(state)
-        # Try to extract a city, naive approach: last token or after 'in'
-        lower = question.lower()
-        city = ""
-        if " in " in lower:
-            city = question.split(" in ")[-1].strip(" ?!.,")
-        if not city:
-            city = "London"  # default fallback
-
-        raw = fetch_weather(city)
-        summary = summarize_weather(raw, city)
-
-        # persist weather summary into vector db (demonstrates embeddings storage)
-        embeddings = build_embeddings()
-        vs = get_vectorstore(embeddings)
+        cities = extract_cities(question) or ["London"]  # default fallback
+        reset_last_provider()
+
+        if len(cities) == 1:
+            city = cities[0]
+            raw = fetch_weather(city)
+            summary = summarize_weather(raw, city)
+            per_city = [{"city": city, "summary": summary}]
+        else:
+            # Fan out: all cities are fetched concurrently, then summarized in one LLM call
+            results = fetch_weather_many(cities)
+            summary = summarize_weather_many(results)
+            per_city = [
+                {"city": r["city"], "summary": template_summary(r["data"], r["city"])}
+                if "data" in r
+                else {"city": r["city"], "error": r["error"]}
+                for r in results
+            ]
+
+        # persist weather summaries into vector db (demonstrates embeddings storage)
+        stored = [r for r in per_city if "summary" in r]
+        texts = [r["summary"] for r in stored]
+        metadatas = [{"type": "weather", "city": r["city"]} for r in stored]
         try:
-            vs.add_texts([summary], metadatas=[{"type": "weather", "city": city}])
-        except RuntimeError as exc:
-            msg = str(exc)
-            if "There is no current event loop" in msg or "no running event loop" in msg:
-                import asyncio
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                loop.run_until_complete(vs.aadd_texts([summary], metadatas=[{"type": "weather", "city": city}]))
-            else:
+            embeddings = get_embeddings()
+            vs = get_vectorstore(embeddings)
+            try:
+                vs.add_texts(texts, metadatas=metadatas)
+            except BackendBusy:
                 raise
+            except RuntimeError as exc:
+                msg = str(exc)
+                if "There is no current event loop" in msg or "no running event loop" in msg:
+                    import asyncio
+                    try:
+                        loop = asyncio.get_event_loop()
+                    except RuntimeError:
+                        loop = asyncio.new_event_loop()
+                        asyncio.set_event_loop(loop)
+                    loop.run_until_complete(vs.aadd_texts(texts, metadatas=metadatas))
+                else:
+                    raise
+        except BackendBusy as exc:
+            # The summaries are already computed; an overloaded embeddings/Qdrant backend only skips this side write
+            try:
+                print(f"[weather_node] skipped storing summaries: {exc}")
+            except Exception:
+                pass
         try:
-            print(f"[weather_node] city='{city}', summary_len={len(summary)}")
+            print(f"[weather_node] cities={cities}, summary_len={len(summary)}")
         except Exception:
             pass
 
         return {
             "answer": summary,
             "route": "weather",
+            "weather": per_city,
+            "provider": last_provider(),
         }
+    except BackendBusy:
+        raise
     except Exception as exc:
         return {
             "answer": f"Weather lookup unavailable right now. Details: {exc}",
@@ -110,7 +152,7 @@ def weather_node(state: RouterState) -> RouterState:
 def rag_node(state: RouterState) -> RouterState:
     try:
         question = _extract_question(state)
-        res = rag_answer(question)
+        res = rag_answer(question, file_sha256=state.get("file_sha256") if isinstance(state, dict) else None)
         try:
             print(f"[rag_node] answer_len={len(res.get('answer',''))}, sources={len(res.get('sources',[]))}")
         except Exception:
@@ -119,7 +161,10 @@ def rag_node(state: RouterState) -> RouterState:
             "answer": res["answer"],
             "sources": res.get("sources", []),
             "route": "rag",
+            "provider": res.get("provider"),
         }
+    except BackendBusy:
+        raise
     except Exception as exc:
         return {
             "answer": f"RAG is unavailable right now. Details: {exc}",
@@ -129,6 +174,9 @@ def rag_node(state: RouterState) -> RouterState:
 
 
 def build_graph():
+    # Imported here so `import src.graph` does not pay for langgraph until a graph is built
+    from langgraph.graph import StateGraph, START, END
+
     g = StateGraph(RouterState)
     g.add_node("weather", weather_node)
     g.add_node("rag", rag_node)
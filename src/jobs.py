@@ -0,0 +1,303 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+try:
+    from src.config import get_settings
+    from src.rag import ingest_pdf_into_qdrant
+    from src.startup import INGEST_PREWARM_STEPS, prewarm_in_background, should_prewarm
+    from src.summaries import summaries_enabled
+except Exception:
+    from config import get_settings
+    from rag import ingest_pdf_into_qdrant
+    from startup import INGEST_PREWARM_STEPS, prewarm_in_background, should_prewarm
+    from summaries import summaries_enabled
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_COLUMNS = (
+    "id",
+    "path",
+    "collection",
+    "dedupe_key",
+    "status",
+    "pages_processed",
+    "total_chunks",
+    "chunks_processed",
+    "chunks_per_second",
+    "error",
+    "created_at",
+    "started_at",
+    "finished_at",
+    "owner",
+    "heartbeat_at",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL,
+    pages_processed INTEGER NOT NULL DEFAULT 0,
+    total_chunks INTEGER,
+    chunks_processed INTEGER NOT NULL DEFAULT 0,
+    chunks_per_second REAL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    heartbeat_at REAL
+)
+"""
+
+# Owners refresh their jobs' heartbeat this often; a job whose heartbeat is older
+# than JOB_STALE_AFTER_S (or whose owner pid is gone on this host) is orphaned.
+JOB_HEARTBEAT_S = 5.0
+JOB_STALE_AFTER_S = 30.0
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class IngestJobManager:
+    """Runs PDF ingestion in a bounded worker pool and tracks jobs in SQLite.
+
+    `submit` returns immediately with a job id; callers poll `get_job` for
+    status and counters. `max_workers` caps concurrent ingests so they do not
+    starve query traffic of embedding/Qdrant capacity.
+
+    Several processes (the UI, the service, the CLI) may share one database.
+    Each job records the process that owns it, and the owner keeps a heartbeat
+    on it. A manager only recovers jobs whose owner is gone: it fails their
+    interrupted running jobs and adopts their queued ones. With `read_only`
+    no worker pool is started and nothing is recovered (e.g. `--status`).
+    With STARTUP_PREWARM=true a worker manager warms the ingest clients in the
+    background as soon as it is created.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_workers: int = 1,
+        read_only: bool = False,
+        heartbeat_s: float = JOB_HEARTBEAT_S,
+        stale_after_s: float = JOB_STALE_AFTER_S,
+    ) -> None:
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(_SCHEMA)
+        self._migrate()
+        self._conn.commit()
+        self.read_only = read_only
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stale_after_s = stale_after_s
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        if read_only:
+            return
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="ingest")
+        if should_prewarm():
+            prewarm_in_background([*INGEST_PREWARM_STEPS, *(["llm"] if summaries_enabled() else [])])
+        self._recover()
+        self._heartbeat = threading.Thread(
+            target=self._heartbeat_loop, args=(heartbeat_s,), name="ingest-heartbeat", daemon=True
+        )
+        self._heartbeat.start()
+
+    def _migrate(self) -> None:
+        # Databases created before owner tracking lack these columns
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(ingest_jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE ingest_jobs ADD COLUMN {column} {kind}")
+
+    def _heartbeat_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                with self._lock:
+                    self._conn.execute(
+                        "UPDATE ingest_jobs SET heartbeat_at = ? WHERE owner = ? AND status IN (?, ?)",
+                        (time.time(), self.owner, QUEUED, RUNNING),
+                    )
+                    self._conn.commit()
+            except sqlite3.Error as exc:
+                print(f"[ingest_job] heartbeat failed: {exc}")
+
+    def _owner_gone(self, owner: Optional[str], heartbeat_at: Optional[float]) -> bool:
+        if owner == self.owner:
+            return False
+        if not owner or heartbeat_at is None or time.time() - heartbeat_at > self._stale_after_s:
+            return True
+        host, _, rest = owner.partition(":")
+        pid = rest.partition(":")[0]
+        return host == socket.gethostname() and pid.isdigit() and not _pid_alive(int(pid))
+
+    def _recover(self) -> None:
+        adopted = []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, path, collection, status, owner, heartbeat_at FROM ingest_jobs "
+                "WHERE status IN (?, ?) ORDER BY created_at",
+                (QUEUED, RUNNING),
+            ).fetchall()
+            now = time.time()
+            for row in rows:
+                if not self._owner_gone(row["owner"], row["heartbeat_at"]):
+                    continue
+                # Compare-and-set on the old owner so two recovering processes cannot both take a job
+                if row["status"] == RUNNING:
+                    # Cannot be resumed mid-upsert
+                    self._conn.execute(
+                        "UPDATE ingest_jobs SET status = ?, error = ?, finished_at = ? "
+                        "WHERE id = ? AND status = ? AND owner IS ?",
+                        (FAILED, "interrupted: owning process stopped", now, row["id"], RUNNING, row["owner"]),
+                    )
+                    continue
+                claimed = self._conn.execute(
+                    "UPDATE ingest_jobs SET owner = ?, heartbeat_at = ? WHERE id = ? AND status = ? AND owner IS ?",
+                    (self.owner, now, row["id"], QUEUED, row["owner"]),
+                ).rowcount
+                if claimed:
+                    adopted.append(row)
+            self._conn.commit()
+        for row in adopted:
+            self._pool.submit(self._run, row["id"], row["path"], row["collection"])
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE ingest_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def submit(self, path: str, collection: Optional[str] = None, dedupe_key: Optional[str] = None) -> str:
+        """Queue an ingest and return its job id without waiting for it.
+
+        With `dedupe_key` (e.g. the file's sha256), an existing queued, running
+        or finished job for the same key and collection is returned instead.
+        """
+        if self._pool is None:
+            raise RuntimeError("This job manager is read-only; it cannot run ingests")
+        collection = collection or get_settings().qdrant_collection
+        with self._lock:
+            if dedupe_key:
+                row = self._conn.execute(
+                    "SELECT id FROM ingest_jobs WHERE dedupe_key = ? AND collection = ? AND status != ? "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (dedupe_key, collection, FAILED),
+                ).fetchone()
+                if row is not None:
+                    return row["id"]
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self._conn.execute(
+                "INSERT INTO ingest_jobs (id, path, collection, dedupe_key, status, created_at, owner, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, path, collection, dedupe_key, QUEUED, now, self.owner, now),
+            )
+            self._conn.commit()
+        self._pool.submit(self._run, job_id, path, collection)
+        return job_id
+
+    def _run(self, job_id: str, path: str, collection: str) -> None:
+        started = time.time()
+        with self._lock:
+            # Skip jobs another process has taken over meanwhile
+            claimed = self._conn.execute(
+                "UPDATE ingest_jobs SET status = ?, started_at = ?, heartbeat_at = ? "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (RUNNING, started, started, job_id, QUEUED, self.owner),
+            ).rowcount
+            self._conn.commit()
+        if not claimed:
+            return
+
+        def progress(update: Dict[str, Any]) -> None:
+            fields = dict(update)
+            if "chunks_processed" in fields:
+                elapsed = max(time.time() - started, 1e-6)
+                fields["chunks_per_second"] = fields["chunks_processed"] / elapsed
+            self._update(job_id, **fields)
+
+        try:
+            res = ingest_pdf_into_qdrant(path, collection, progress=progress)
+            elapsed = max(time.time() - started, 1e-6)
+            self._update(
+                job_id,
+                status=DONE,
+                pages_processed=res["num_pages"],
+                total_chunks=res["num_chunks"],
+                chunks_processed=res["num_chunks"],
+                chunks_per_second=res["num_chunks"] / elapsed,
+                finished_at=time.time(),
+            )
+            print(f"[ingest_job] id={job_id} chunks={res['num_chunks']} elapsed={elapsed:.1f}s")
+        except Exception as exc:
+            self._update(job_id, status=FAILED, error=str(exc), finished_at=time.time())
+            print(f"[ingest_job] id={job_id} failed: {exc}")
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM ingest_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM ingest_jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def wait(self, job_id: str, poll_interval: float = 0.5, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until the job finishes (used by the CLI); returns the final job row."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.get_job(job_id)
+            if job is None or job["status"] in (DONE, FAILED):
+                return job or {}
+            if deadline is not None and time.time() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+        with self._lock:
+            self._conn.close()
+
+
+_JOB_MANAGER: IngestJobManager | None = None
+_JOB_MANAGER_LOCK = threading.Lock()
+
+
+def get_job_manager() -> IngestJobManager:
+    global _JOB_MANAGER
+    with _JOB_MANAGER_LOCK:
+        if _JOB_MANAGER is None:
+            settings = get_settings()
+            _JOB_MANAGER = IngestJobManager(settings.ingest_jobs_db, settings.ingest_max_concurrent_jobs)
+    return _JOB_MANAGER
@@ -1,7 +1,7 @@
 from typing import Any, Dict, List
 import os
+import threading
 
-from langchain_huggingface import ChatHuggingFace
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import (
@@ -11,17 +11,15 @@ from langchain_core.messages import (
     AIMessage,
 )
 from langchain_core.outputs import ChatResult, ChatGeneration
-from huggingface_hub import InferenceClient
-
-try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-except Exception:
-    ChatGoogleGenerativeAI = None  # type: ignore
 
 try:
+    from src.admission import admit
     from src.config import get_settings
+    from src.providers import Provider, ProviderRouter, routing_enabled
 except Exception:
+    from admission import admit
     from config import get_settings
+    from providers import Provider, ProviderRouter, routing_enabled
 
 
 class HFNScaleChat(BaseChatModel):
@@ -40,6 +38,9 @@ class HFNScaleChat(BaseChatModel):
         provider: str = "nscale",
     ) -> None:
         super().__init__()
+        # Imported here so only the HF provider path pays for huggingface_hub
+        from huggingface_hub import InferenceClient
+
         self._model = model
         self._temperature = float(temperature)
         self._max_new_tokens = int(max_new_tokens)
@@ -91,13 +92,39 @@ class HFNScaleChat(BaseChatModel):
         return ChatResult(generations=[ChatGeneration(message=ai_msg)])
 
 
+class AdmittedChatModel(BaseChatModel):
+    """Wraps a remote chat model so every call goes through its admission backend.
+
+    Calls queue for a rate token and concurrency slot of `backend` (e.g. "llm:google"),
+    back off on 429s, and raise `BackendBusy` when the provider is saturated.
+    """
+
+    def __init__(self, inner: BaseChatModel, backend: str) -> None:
+        super().__init__()
+        self._inner = inner
+        self._backend = backend
+
+    @property
+    def _llm_type(self) -> str:  # type: ignore[override]
+        return self._inner._llm_type
+
+    @property
+    def _identifying_params(self) -> dict:  # type: ignore[override]
+        return {"backend": self._backend, **self._inner._identifying_params}
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: None = None, run_manager: None = None, **kwargs: Any
+    ) -> ChatResult:
+        reply = admit(self._backend, lambda: self._inner.invoke(messages, stop=stop, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+
 def build_llm() -> BaseChatModel:
     """Return a chat model that uses HF InferenceClient with provider nscale when remote.
 
     Remote is enforced when LLM_BACKEND=remote. If no token is available, raise a clear error.
     If LLM_BACKEND=local, build a small local model.
     """
-    settings = get_settings()
     backend_override = os.getenv("LLM_BACKEND", "").strip().lower()
     provider_override = os.getenv("LLM_PROVIDER", "").strip().lower()
 
@@ -105,32 +132,56 @@ def build_llm() -> BaseChatModel:
         return _build_local_chat_llm()
 
     # Prefer Google if explicitly selected or GOOGLE_API_KEY is present
-    google_key_env = os.getenv("GOOGLE_API_KEY") or getattr(settings, "google_api_key", "")
+    google_key_env = _google_api_key()
     if provider_override == "google" or (not provider_override and google_key_env):
-        google_key = google_key_env
-        if not google_key:
+        if not google_key_env:
             raise RuntimeError("GOOGLE_API_KEY is required when LLM_PROVIDER=google")
-        if ChatGoogleGenerativeAI is None:
-            raise RuntimeError("langchain-google-genai is not installed. Add it to requirements.txt and pip install.")
-        google_model = os.getenv("GOOGLE_LLM_MODEL") or getattr(settings, "google_llm_model", "gemini-1.5-flash")
-        return ChatGoogleGenerativeAI(model=google_model, api_key=google_key, temperature=0.3, max_output_tokens=512)
+        return _build_google_chat()
+
+    if not _hf_api_key():
+        raise RuntimeError(
+            "LLM_BACKEND=remote requires a provider API key. Set GOOGLE_API_KEY (preferred) or HF_TOKEN/HUGGINGFACE_API_KEY in .env"
+        )
+    return _build_hf_chat()
+
+
+def _google_api_key() -> str:
+    return os.getenv("GOOGLE_API_KEY") or getattr(get_settings(), "google_api_key", "")
 
-    # Remote path: prefer common HF token env vars, then fallback to HUGGINGFACE_API_KEY
-    api_key = (
+
+def _hf_api_key() -> str:
+    # Prefer common HF token env vars, then fallback to HUGGINGFACE_API_KEY
+    return (
         os.getenv("HF_TOKEN")
         or os.getenv("HUGGINGFACEHUB_API_TOKEN")
         or os.getenv("HUGGING_FACE_HUB_TOKEN")
-        or getattr(settings, "huggingface_api_key", "")
+        or getattr(get_settings(), "huggingface_api_key", "")
     )
-    if not api_key:
-        raise RuntimeError(
-            "LLM_BACKEND=remote requires a provider API key. Set GOOGLE_API_KEY (preferred) or HF_TOKEN/HUGGINGFACE_API_KEY in .env"
-        )
 
+
+def _build_google_chat() -> BaseChatModel:
+    settings = get_settings()
+    google_key = _google_api_key()
+    if not google_key:
+        raise RuntimeError("GOOGLE_API_KEY is required for the Google provider")
+    try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+    except Exception as exc:
+        raise RuntimeError("langchain-google-genai is not installed. Add it to requirements.txt and pip install.") from exc
+    google_model = os.getenv("GOOGLE_LLM_MODEL") or getattr(settings, "google_llm_model", "gemini-1.5-flash")
+    chat = ChatGoogleGenerativeAI(model=google_model, api_key=google_key, temperature=0.3, max_output_tokens=512)
+    return AdmittedChatModel(chat, "llm:google")
+
+
+def _build_hf_chat() -> BaseChatModel:
+    settings = get_settings()
+    api_key = _hf_api_key()
+    if not api_key:
+        raise RuntimeError("HF_TOKEN/HUGGINGFACE_API_KEY is required for the Hugging Face provider")
     model_id = getattr(settings, "hf_llm_model", "Qwen/Qwen3-4B-Thinking-2507")
     provider = os.getenv("HF_PROVIDER", "nscale").strip() or "nscale"
     try:
-        return HFNScaleChat(
+        chat = HFNScaleChat(
             model=model_id,
             api_key=api_key,
             temperature=0.3,
@@ -142,6 +193,93 @@ def build_llm() -> BaseChatModel:
             "Failed to initialize HF InferenceClient (provider=nscale). "
             "Verify HF_TOKEN (or HUGGINGFACE_API_KEY) and HF_LLM_MODEL. Details: " + str(exc)
         )
+    return AdmittedChatModel(chat, "llm:hf")
+
+
+_LAST_PROVIDER = threading.local()
+
+
+def last_provider() -> str | None:
+    """Provider that served the most recent routed chat call on this thread (None if it failed or was not routed)."""
+    return getattr(_LAST_PROVIDER, "name", None)
+
+
+def reset_last_provider() -> None:
+    _LAST_PROVIDER.name = None
+
+
+class RoutedChatModel(BaseChatModel):
+    """Chat model that dispatches each call through a `ProviderRouter` (hedging + failover).
+
+    The serving provider is stored in the reply's `response_metadata["provider"]`
+    and in `last_provider()`.
+    """
+
+    def __init__(self, router) -> None:
+        super().__init__()
+        self._router = router
+
+    @property
+    def _llm_type(self) -> str:  # type: ignore[override]
+        return "routed"
+
+    @property
+    def _identifying_params(self) -> dict:  # type: ignore[override]
+        return {"providers": [p.name for p in self._router.providers]}
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: None = None, run_manager: None = None, **kwargs: Any
+    ) -> ChatResult:
+        _LAST_PROVIDER.name = None
+        reply, provider = self._router.call(lambda model: model.invoke(messages, stop=stop, **kwargs))
+        _LAST_PROVIDER.name = provider
+        metadata = dict(getattr(reply, "response_metadata", {}) or {})
+        metadata["provider"] = provider
+        ai_msg = AIMessage(content=format_output(reply), response_metadata=metadata)
+        return ChatResult(generations=[ChatGeneration(message=ai_msg)])
+
+    def provider_stats(self) -> List[Dict[str, Any]]:
+        return self._router.stats()
+
+
+_LLM_BUILDERS = {
+    "google": _build_google_chat,
+    "hf": _build_hf_chat,
+    "local": lambda: _build_local_chat_llm(),
+}
+
+
+def _routed_llm_providers() -> List[str]:
+    """LLM_PROVIDERS (comma-separated, in preference order) or every provider with a key."""
+    names = [n.strip().lower() for n in get_settings().llm_providers.split(",") if n.strip()]
+    if not names:
+        names = (["google"] if _google_api_key() else []) + (["hf"] if _hf_api_key() else [])
+    unknown = [n for n in names if n not in _LLM_BUILDERS]
+    if unknown:
+        raise RuntimeError(f"Unknown LLM provider(s) in LLM_PROVIDERS: {', '.join(unknown)}")
+    return names
+
+
+_CACHED_LLM: BaseChatModel | None = None
+_LLM_LOCK = threading.Lock()
+
+
+def get_llm() -> BaseChatModel:
+    """Return a process-wide chat model, built on first use.
+
+    With PROVIDER_ROUTING=true and more than one provider available this is a
+    `RoutedChatModel`; otherwise the single model from `build_llm`.
+    """
+    global _CACHED_LLM
+    with _LLM_LOCK:
+        if _CACHED_LLM is None:
+            names = _routed_llm_providers() if routing_enabled() else []
+            if len(names) > 1:
+                router = ProviderRouter("llm", [Provider(n, _LLM_BUILDERS[n]) for n in names])
+                _CACHED_LLM = RoutedChatModel(router)
+            else:
+                _CACHED_LLM = build_llm()
+    return _CACHED_LLM
 
 
 def _build_local_chat_llm() -> BaseChatModel:
@@ -151,6 +289,7 @@ def _build_local_chat_llm() -> BaseChatModel:
     """
     from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
     from langchain_community.llms import HuggingFacePipeline
+    from langchain_huggingface import ChatHuggingFace
 
     local_model = os.getenv("LOCAL_LLM_MODEL", "google/flan-t5-small")
     tokenizer = AutoTokenizer.from_pretrained(local_model)
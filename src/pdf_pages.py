@@ -0,0 +1,236 @@
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from src.config import get_settings
+except Exception:
+    from config import get_settings
+
+
+# Kept import-light on purpose: ProcessPoolExecutor workers import this module.
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Below this many uncached pages a process pool costs more to start than it saves
+PARALLEL_MIN_PAGES = 32
+
+
+def file_sha256(path: str | Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+# --- Parser backends --------------------------------------------------------
+# Each backend provides `count(path) -> int` and `extract(path, start, end) -> List[str]`
+# (text of pages [start, end)). Register new ones in _BACKENDS.
+
+
+def _pypdf_count(path: str) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(path).pages)
+
+
+def _pypdf_extract(path: str, start: int, end: int) -> List[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _pymupdf_count(path: str) -> int:
+    import fitz
+
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def _pymupdf_extract(path: str, start: int, end: int) -> List[str]:
+    import fitz
+
+    with fitz.open(path) as doc:
+        return [doc.load_page(i).get_text() for i in range(start, end)]
+
+
+_BACKENDS: Dict[str, Tuple[Callable[[str], int], Callable[[str, int, int], List[str]]]] = {
+    "pypdf": (_pypdf_count, _pypdf_extract),
+    "pymupdf": (_pymupdf_count, _pymupdf_extract),
+}
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Pick a parser backend: explicit name, else PDF_PARSER, else PyMuPDF when installed, else pypdf."""
+    name = (name or get_settings().pdf_parser or "auto").strip().lower()
+    if name != "auto":
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown PDF parser '{name}'. Choose one of: auto, {', '.join(_BACKENDS)}")
+        return name
+    try:
+        import fitz  # noqa: F401
+
+        return "pymupdf"
+    except Exception:
+        return "pypdf"
+
+
+def _extract_range(backend: str, path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    texts = _BACKENDS[backend][1](path, start, end)
+    return list(zip(range(start, end), texts))
+
+
+# --- Page text cache --------------------------------------------------------
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS pdf_files (file_sha256 TEXT PRIMARY KEY, num_pages INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS pdf_pages ("
+    " file_sha256 TEXT NOT NULL, page INTEGER NOT NULL, text TEXT NOT NULL, backend TEXT NOT NULL,"
+    " PRIMARY KEY (file_sha256, page))",
+)
+
+
+class PageTextCache:
+    """SQLite cache of extracted page text keyed by (file sha256, page number)."""
+
+    def __init__(self, db_path: str) -> None:
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+        self._conn.commit()
+
+    def num_pages(self, file_hash: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT num_pages FROM pdf_files WHERE file_sha256 = ?", (file_hash,)).fetchone()
+        return row[0] if row else None
+
+    def get_pages(self, file_hash: str) -> Dict[int, str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page, text FROM pdf_pages WHERE file_sha256 = ?", (file_hash,)
+            ).fetchall()
+        return {page: text for page, text in rows}
+
+    def put_pages(self, file_hash: str, num_pages: int, pages: List[Tuple[int, str]], backend: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pdf_files (file_sha256, num_pages) VALUES (?, ?)", (file_hash, num_pages)
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pdf_pages (file_sha256, page, text, backend) VALUES (?, ?, ?, ?)",
+                [(file_hash, page, text, backend) for page, text in pages],
+            )
+            self._conn.commit()
+
+
+_PAGE_CACHE: PageTextCache | None = None
+_PAGE_CACHE_LOCK = threading.Lock()
+
+
+def get_page_cache() -> PageTextCache:
+    global _PAGE_CACHE
+    with _PAGE_CACHE_LOCK:
+        if _PAGE_CACHE is None:
+            _PAGE_CACHE = PageTextCache(get_settings().pdf_page_cache_db)
+    return _PAGE_CACHE
+
+
+# --- Extraction -------------------------------------------------------------
+
+
+def _page_ranges(pages: List[int], workers: int) -> List[Tuple[int, int]]:
+    """Split sorted page numbers into at most `workers` contiguous [start, end) ranges."""
+    if not pages:
+        return []
+    runs: List[Tuple[int, int]] = []
+    start = prev = pages[0]
+    for p in pages[1:]:
+        if p != prev + 1:
+            runs.append((start, prev + 1))
+            start = p
+        prev = p
+    runs.append((start, prev + 1))
+    target = max(1, -(-len(pages) // max(1, workers)))
+    ranges: List[Tuple[int, int]] = []
+    for start, end in runs:
+        for s in range(start, end, target):
+            ranges.append((s, min(s + target, end)))
+    return ranges
+
+
+def extract_pages(
+    pdf_path: str | Path,
+    backend: Optional[str] = None,
+    workers: Optional[int] = None,
+    cache: Optional[PageTextCache] = None,
+    on_page: Optional[Callable[[int], None]] = None,
+) -> Tuple[str, List[str]]:
+    """Return `(file_sha256, page_texts)` for a PDF, parsing only pages not already cached.
+
+    Uncached pages are split into contiguous ranges across a process pool
+    (`PDF_PARSE_WORKERS`, default CPU count) once there are enough of them to
+    amortise worker start-up. `on_page` receives the running count of pages done.
+    """
+    path = str(pdf_path)
+    file_hash = file_sha256(path)
+    cache = cache or get_page_cache()
+    cached = cache.get_pages(file_hash)
+    total = cache.num_pages(file_hash)
+    backend = resolve_backend(backend)
+    if total is None:
+        total = _BACKENDS[backend][0](path)
+
+    missing = [p for p in range(total) if p not in cached]
+    done = total - len(missing)
+    if on_page is not None and done:
+        on_page(done)
+    if not missing:
+        return file_hash, [cached[p] for p in range(total)]
+
+    started = time.perf_counter()
+    workers = workers or get_settings().pdf_parse_workers or os.cpu_count() or 1
+    if workers <= 1 or len(missing) < PARALLEL_MIN_PAGES:
+        ranges = _page_ranges(missing, 1)
+        results = [_extract_range(backend, path, s, e) for s, e in ranges]
+        for extracted in results:
+            cached.update(extracted)
+        done += len(missing)
+        if on_page is not None:
+            on_page(done)
+    else:
+        ranges = _page_ranges(missing, workers)
+        # spawn, not fork: callers are multi-threaded (ingest workers, Streamlit, uvicorn) and a
+        # forked child can inherit locks held by other threads at fork time
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)), mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            futures = [pool.submit(_extract_range, backend, path, s, e) for s, e in ranges]
+            for fut in as_completed(futures):
+                extracted = fut.result()
+                cached.update(extracted)
+                done += len(extracted)
+                if on_page is not None:
+                    on_page(done)
+
+    cache.put_pages(file_hash, total, [(p, cached[p]) for p in missing], backend)
+    try:
+        print(
+            f"[pdf_pages] parsed {len(missing)}/{total} pages with {backend} "
+            f"in {time.perf_counter() - started:.2f}s ({len(ranges)} ranges)"
+        )
+    except Exception:
+        pass
+    return file_hash, [cached[p] for p in range(total)]
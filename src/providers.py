@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from src.admission import BackendBusy, submit_in_context
+    from src.config import get_settings
+except Exception:
+    from admission import BackendBusy, submit_in_context
+    from config import get_settings
+
+
+def routing_enabled() -> bool:
+    return get_settings().provider_routing.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Provider:
+    """One backend (e.g. Google, HF nscale) with a lazily built client, latency window and circuit breaker."""
+
+    def __init__(self, name: str, factory: Callable[[], Any], window: int = 200) -> None:
+        self.name = name
+        self._factory = factory
+        self._client: Any = None
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def client(self) -> Any:
+        with self._lock:
+            if self._client is None:
+                self._client = self._factory()
+            return self._client
+
+    def record(self, ok: bool, latency_s: float, breaker_failures: int, breaker_cooldown_s: float) -> None:
+        with self._lock:
+            self.calls += 1
+            if ok:
+                self._latencies.append(latency_s)
+                self.consecutive_failures = 0
+                self.open_until = 0.0
+                return
+            self.errors += 1
+            self.consecutive_failures += 1
+            # After the cooldown one trial call is let through (half-open); a failure re-opens it
+            if self.consecutive_failures >= breaker_failures:
+                self.open_until = time.monotonic() + breaker_cooldown_s
+
+    def is_available(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def latency_quantile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < max(1, min_samples):
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.latency_quantile(0.50, 1)
+        p95 = self.latency_quantile(0.95, 1)
+        return {
+            "provider": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "circuit": "open" if not self.is_available() else "closed",
+        }
+
+
+_ROUTERS: Dict[str, "ProviderRouter"] = {}
+_ROUTERS_LOCK = threading.Lock()
+
+
+def router_stats() -> Dict[str, List[Dict[str, Any]]]:
+    """Per-provider stats of every router built so far in this process, keyed by kind."""
+    with _ROUTERS_LOCK:
+        routers = dict(_ROUTERS)
+    return {kind: router.stats() for kind, router in routers.items()}
+
+
+class ProviderRouter:
+    """Calls the first healthy provider, hedging to the next one when the call runs past the provider's p95.
+
+    Providers are tried in preference order. A failing call fails over to the next
+    provider immediately; a slow call gets one hedged request, and whichever
+    answers first wins (the other result is discarded but still recorded).
+    Providers whose breaker is open are skipped until their cooldown ends.
+    """
+
+    def __init__(self, kind: str, providers: List[Provider]) -> None:
+        settings = get_settings()
+        self.kind = kind
+        self.providers = providers
+        self._hedge_default_s = settings.provider_hedge_after_s
+        self._hedge_min_samples = settings.provider_hedge_min_samples
+        self._breaker_failures = max(1, settings.provider_breaker_failures)
+        self._breaker_cooldown_s = settings.provider_breaker_cooldown_s
+        self._pool = ThreadPoolExecutor(max_workers=settings.provider_max_workers, thread_name_prefix=f"{kind}-router")
+        with _ROUTERS_LOCK:
+            _ROUTERS[kind] = self
+
+    def _timed(self, provider: Provider, fn: Callable[[Any], Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            result = fn(provider.client())
+        except BackendBusy:
+            raise  # shed by admission control: fail over, but it says nothing about the provider's health
+        except Exception:
+            provider.record(False, time.perf_counter() - started, self._breaker_failures, self._breaker_cooldown_s)
+            raise
+        provider.record(True, time.perf_counter() - started, self._breaker_failures, self._breaker_cooldown_s)
+        return result
+
+    def _hedge_delay(self, provider: Provider) -> float:
+        p95 = provider.latency_quantile(0.95, self._hedge_min_samples)
+        return p95 if p95 is not None else self._hedge_default_s
+
+    def call(self, fn: Callable[[Any], Any]) -> Tuple[Any, str]:
+        """Run `fn(client)` and return `(result, provider_name)` of the first successful provider."""
+        candidates = [p for p in self.providers if p.is_available()]
+        if not candidates:
+            raise RuntimeError(f"All {self.kind} providers are unavailable (circuit open)")
+
+        pending: Dict[Future, Provider] = {}
+        errors: List[str] = []
+        busy: List[BackendBusy] = []
+        next_idx = 0
+        hedges_left = 1 if self._hedge_default_s > 0 else 0
+
+        def launch() -> Provider:
+            nonlocal next_idx
+            provider = candidates[next_idx]
+            next_idx += 1
+            pending[submit_in_context(self._pool, self._timed, provider, fn)] = provider
+            return provider
+
+        primary = launch()
+        while pending:
+            can_hedge = hedges_left > 0 and next_idx < len(candidates)
+            timeout = self._hedge_delay(primary) if can_hedge else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedges_left -= 1
+                hedge = launch()
+                try:
+                    print(f"[router] {self.kind}: {primary.name} slower than {timeout:.2f}s, hedging to {hedge.name}")
+                except Exception:
+                    pass
+                continue
+            for fut in done:
+                provider = pending.pop(fut)
+                try:
+                    return fut.result(), provider.name
+                except Exception as exc:
+                    if isinstance(exc, BackendBusy):
+                        busy.append(exc)
+                    errors.append(f"{provider.name}: {exc}")
+            if not pending and next_idx < len(candidates):
+                primary = launch()  # failover
+        if busy and len(busy) == len(errors):
+            # Every provider shed the call: keep it a BackendBusy so callers answer 503 + Retry-After
+            soonest = min(busy, key=lambda exc: exc.retry_after)
+            raise BackendBusy(f"all {self.kind} providers", soonest.retry_after, "; ".join(errors))
+        raise RuntimeError(f"All {self.kind} providers failed: " + "; ".join(errors))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [p.snapshot() for p in self.providers]
@@ -1,32 +1,117 @@
 from pathlib import Path
-from typing import Iterable, List, Dict, Any
+import uuid
+from typing import Callable, Iterable, List, Dict, Any, Optional
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
 from langchain_core.vectorstores import VectorStoreRetriever
 
 try:
-    from src.embeddings import build_embeddings
-    from src.vectorstore import get_vectorstore
-    from src.llm import build_llm, build_answer_prompt, format_output
+    from src.admission import BackendBusy, wait_while_busy
+    from src.embeddings import get_embeddings
+    from src.vectorstore import build_search_params, get_vectorstore
+    from src.config import get_settings
+    from src.llm import get_llm, build_answer_prompt, format_output, last_provider, reset_last_provider
+    from src.pdf_pages import extract_pages
+    from src.chunk_store import get_chunk_store
+    from src.summaries import (
+        answer_from_summaries,
+        build_summary_nodes,
+        note_summaries_stored,
+        summaries_available,
+        chunks_only_filter,
+        is_summary_question,
+        summaries_enabled,
+        summary_node_ids,
+    )
 except Exception:
-    from embeddings import build_embeddings
-    from vectorstore import get_vectorstore
-    from llm import build_llm, build_answer_prompt, format_output
+    from admission import BackendBusy, wait_while_busy
+    from embeddings import get_embeddings
+    from vectorstore import build_search_params, get_vectorstore
+    from config import get_settings
+    from llm import get_llm, build_answer_prompt, format_output, last_provider, reset_last_provider
+    from pdf_pages import extract_pages
+    from chunk_store import get_chunk_store
+    from summaries import (
+        answer_from_summaries,
+        build_summary_nodes,
+        note_summaries_stored,
+        summaries_available,
+        chunks_only_filter,
+        is_summary_question,
+        summaries_enabled,
+        summary_node_ids,
+    )
 
 
-def load_pdf(pdf_path: str | Path) -> List[Document]:
-    loader = PyPDFLoader(str(pdf_path))
-    return loader.load()
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def load_pdf(pdf_path: str | Path, on_page: Optional[Callable[[int], None]] = None) -> List[Document]:
+    """Load one Document per page; page text comes from the parsed-text cache when available."""
+    file_hash, texts = extract_pages(pdf_path, on_page=on_page)
+    return [
+        Document(
+            page_content=text,
+            metadata={"source": str(pdf_path), "page": i, "total_pages": len(texts), "file_sha256": file_hash},
+        )
+        for i, text in enumerate(texts)
+    ]
 
 
 def split_documents(documents: List[Document], chunk_size: int = 1000, chunk_overlap: int = 150) -> List[Document]:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
     splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
     return splitter.split_documents(documents)
 
 
-def ingest_pdf_into_qdrant(pdf_path: str, collection: str | None = None) -> Dict[str, Any]:
+def _chunk_ids(file_hash: str, chunk_size: int, chunk_overlap: int, count: int) -> List[str]:
+    # Deterministic point ids: re-ingesting the same file with the same chunking overwrites, not duplicates
+    return [str(uuid.uuid5(uuid.NAMESPACE_URL, f"{file_hash}:{chunk_size}:{chunk_overlap}:{i}")) for i in range(count)]
+
+
+def _add_documents(vs, docs: List[Document], ids: Optional[List[str]] = None) -> List[str]:
+    try:
+        return vs.add_documents(docs, ids=ids)
+    except RuntimeError as exc:
+        if "There is no current event loop" in str(exc) or "no running event loop" in str(exc):
+            # Fallback to async add when Streamlit thread lacks an event loop
+            import asyncio
+            try:
+                loop = asyncio.get_event_loop()
+            except RuntimeError:
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+            return loop.run_until_complete(vs.aadd_documents(docs, ids=ids))
+        raise
+
+
+def ingest_pdf_into_qdrant(
+    pdf_path: str,
+    collection: str | None = None,
+    progress: Optional[ProgressCallback] = None,
+    batch_size: int = 64,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 150,
+    summaries: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Parse, split, embed and upsert a PDF.
+
+    Page text is cached by file hash, so re-ingesting or re-chunking with a
+    different `chunk_size`/`chunk_overlap` does not parse the PDF again. Chunks
+    are written to the local chunk store (for `src.reindex`) before they are
+    upserted, so a concurrent reindex copies them even if the upsert lands in
+    the collection it is replacing. Points from an earlier chunking of the same
+    file are removed.
+
+    When `progress` is given it is called with partial counters
+    (`pages_processed`, `total_chunks`, `chunks_processed`) as work advances;
+    chunks are upserted in batches of `batch_size` so progress is granular.
+
+    With `summaries` (default: INGEST_SUMMARIES) page-, section- and
+    document-level summaries are also built and stored as extra nodes, which
+    `rag_answer` uses for summary-style questions.
+    """
     # Ensure an event loop exists for libraries that expect one in Streamlit's ScriptRunner thread
     try:
         import asyncio
@@ -38,48 +123,130 @@ def ingest_pdf_into_qdrant(pdf_path: str, collection: str | None = None) -> Dict
     except Exception:
         pass
 
-    docs = load_pdf(pdf_path)
-    chunks = split_documents(docs)
-    embeddings = build_embeddings()
-    vs = get_vectorstore(embeddings, collection)
-    try:
-        ids = vs.add_documents(chunks)
-    except RuntimeError as exc:
-        if "There is no current event loop" in str(exc) or "no running event loop" in str(exc):
-            # Fallback to async add when Streamlit thread lacks an event loop
-            import asyncio
+    report = progress or (lambda _update: None)
+    on_page = (lambda n: report({"pages_processed": n})) if progress else None
+    docs = load_pdf(pdf_path, on_page=on_page)
+    chunks = split_documents(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    report({"pages_processed": len(docs), "total_chunks": len(chunks), "chunks_processed": 0})
+    embeddings = get_embeddings()
+    # Background work: shed embedding/Qdrant calls are waited out (wait_while_busy) rather than failing the job
+    vs = wait_while_busy(lambda: get_vectorstore(embeddings, collection))
+    file_hash = docs[0].metadata["file_sha256"] if docs else ""
+    chunk_ids = _chunk_ids(file_hash, chunk_size, chunk_overlap, len(chunks))
+    store = get_chunk_store()
+    texts = [c.page_content for c in chunks]
+    metadatas = [c.metadata for c in chunks]
+    # Store first: src.reindex copies from the store, and an upsert can race its alias switch
+    stale = store.replace_file(vs.collection_name, file_hash, chunk_ids, texts, metadatas)
+    ids: List[str] = []
+    step = max(1, int(batch_size))
+    for start in range(0, len(chunks), step):
+        batch, batch_ids = chunks[start : start + step], chunk_ids[start : start + step]
+        ids.extend(wait_while_busy(lambda: _add_documents(vs, batch, batch_ids)))
+        report({"chunks_processed": len(ids)})
+    # Chunks are searchable and stale points gone before any (slow, optional) summarization starts
+    if stale:
+        wait_while_busy(lambda: vs.delete(stale))
+    nodes: List[Document] = []
+    if summaries if summaries is not None else summaries_enabled():
+        try:
+            built = build_summary_nodes(docs)
+            built_ids = summary_node_ids(file_hash, built)
+            # Summary nodes live in the chunk store too (stored first, like chunks), so a reindex re-embeds them
+            store.replace_file(
+                vs.collection_name,
+                file_hash,
+                chunk_ids + built_ids,
+                texts + [n.page_content for n in built],
+                metadatas + [n.metadata for n in built],
+            )
             try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            ids = loop.run_until_complete(vs.aadd_documents(chunks))
-        else:
-            raise
-    return {"num_chunks": len(chunks), "collection": vs.collection_name, "ids": ids}
+                for start in range(0, len(built), step):
+                    batch, batch_ids = built[start : start + step], built_ids[start : start + step]
+                    wait_while_busy(lambda: _add_documents(vs, batch, batch_ids))
+            except Exception:
+                # Keep store and collection in step: drop the nodes from both
+                leftover = store.replace_file(vs.collection_name, file_hash, chunk_ids, texts, metadatas)
+                try:
+                    vs.delete(leftover)
+                except Exception:
+                    pass
+                raise
+            nodes = built
+            if nodes:
+                note_summaries_stored(vs.collection_name)
+        except Exception as exc:
+            # Includes BackendBusy past INGEST_BUSY_MAX_WAIT_S: the PDF stays answerable from its chunks
+            try:
+                print(f"[ingest] summaries skipped for '{pdf_path}': {exc}")
+            except Exception:
+                pass
+    return {
+        "num_chunks": len(chunks),
+        "num_pages": len(docs),
+        "num_summaries": len(nodes),
+        "collection": vs.collection_name,
+        "ids": ids,
+    }
+
 
+def get_retriever(collection: str | None = None, search_k: int | None = None) -> VectorStoreRetriever:
+    """Retriever over PDF chunks (not summary nodes) using RAG_SEARCH_K / RAG_HNSW_EF / RAG_QUANTIZATION_*.
 
-def get_retriever(collection: str | None = None, search_k: int = 4) -> VectorStoreRetriever:
-    embeddings = build_embeddings()
+    `search_k` overrides RAG_SEARCH_K.
+    """
+    settings = get_settings()
+    embeddings = get_embeddings()
     vs = get_vectorstore(embeddings, collection)
-    return vs.as_retriever(search_kwargs={"k": search_k})
+    search_kwargs: Dict[str, Any] = {"k": search_k or settings.rag_search_k, "filter": chunks_only_filter()}
+    rescore = settings.rag_quantization_rescore.strip().lower()
+    params = build_search_params(
+        hnsw_ef=settings.rag_hnsw_ef,
+        rescore={"true": True, "false": False}.get(rescore),
+        oversampling=settings.rag_quantization_oversampling,
+    )
+    if params is not None:
+        search_kwargs["search_params"] = params
+    return vs.as_retriever(search_kwargs=search_kwargs)
 
 
-def rag_answer(question: str, collection: str | None = None) -> Dict[str, Any]:
+def _summary_mode() -> bool:
+    mode = get_settings().rag_summary_mode.strip().lower()
+    return mode in ("1", "true", "yes", "on") if mode else summaries_enabled()
+
+
+def rag_answer(question: str, collection: str | None = None, file_sha256: str | None = None) -> Dict[str, Any]:
+    """Answer from retrieved chunks; summary questions use precomputed summary nodes when available.
+
+    `file_sha256` scopes summary lookups to one PDF (default: the PDF closest to the question).
+    """
     try:
+        if _summary_mode() and is_summary_question(question):
+            vs = get_vectorstore(get_embeddings(), collection)
+            summarized = answer_from_summaries(question, vs, file_sha256) if summaries_available(vs) else None
+            if summarized is not None:
+                return summarized
         retriever = get_retriever(collection)
         # Prefer invoke per deprecation warning; fallback to legacy if needed
         try:
             context_docs = retriever.invoke(question)
+        except BackendBusy:
+            raise
         except Exception:
             context_docs = retriever.get_relevant_documents(question)
         context = "\n\n".join([d.page_content for d in context_docs])
-        llm = build_llm()
+        llm = get_llm()
         prompt = build_answer_prompt("You answer questions based on provided PDF context and cite short quotes.")
         chain = prompt | llm
+        reset_last_provider()
         generated = chain.invoke({"context": context, "question": question})
         answer = format_output(generated)
-        return {"answer": answer, "sources": [getattr(d, 'metadata', {}) for d in context_docs]}
+        result = {"answer": answer, "sources": [getattr(d, 'metadata', {}) for d in context_docs]}
+        if last_provider():
+            result["provider"] = last_provider()
+        return result
+    except BackendBusy:
+        raise  # shed load fast; callers answer "busy" instead of a degraded answer
     except Exception as exc:
         return {"answer": f"RAG unavailable. Details: {exc}", "sources": []}
 
@@ -0,0 +1,120 @@
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+try:
+    from src.chunk_store import ChunkStore, get_chunk_store
+    from src.embeddings import get_embeddings
+    from src.vectorstore import _detect_embedding_dimension, get_qdrant_client, resolve_alias
+except Exception:
+    from chunk_store import ChunkStore, get_chunk_store
+    from embeddings import get_embeddings
+    from vectorstore import _detect_embedding_dimension, get_qdrant_client, resolve_alias
+
+
+# Payload layout used by langchain_qdrant.Qdrant, so re-embedded points stay readable by get_vectorstore
+CONTENT_KEY = "page_content"
+METADATA_KEY = "metadata"
+
+
+def reindex_collection(
+    alias: str,
+    target: Optional[str] = None,
+    batch_size: int = 64,
+    drop_old: bool = False,
+    adopt_legacy: bool = False,
+    embeddings=None,
+    client=None,
+    store: Optional[ChunkStore] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """Re-embed the stored chunks of `alias` into a new collection, then point the alias at it.
+
+    Queries keep hitting the old collection through the alias while the shadow
+    collection fills; the switch is a single `update_collection_aliases` call.
+    Chunks ingested meanwhile (they go to the old collection) are copied in
+    catch-up passes before and right after the switch, and chunks removed from
+    the store meanwhile are deleted from the new collection.
+    If `alias` is still a plain collection (created before aliases were used),
+    it has to be deleted before the alias can take its name; that only happens
+    with `adopt_legacy=True` because points missing from the chunk store would be lost.
+    """
+    from qdrant_client.http.models import (
+        CreateAlias,
+        CreateAliasOperation,
+        DeleteAlias,
+        DeleteAliasOperation,
+        Distance,
+        PointIdsList,
+        PointStruct,
+        VectorParams,
+    )
+
+    client = client or get_qdrant_client()
+    store = store or get_chunk_store()
+    embeddings = embeddings or get_embeddings()
+
+    total = store.count(alias)
+    if total == 0:
+        raise RuntimeError(f"No stored chunks for '{alias}'. Ingest PDFs first so the chunk store is populated.")
+    previous = resolve_alias(client, alias)
+    legacy = previous is None and client.collection_exists(alias)
+    if legacy and not adopt_legacy:
+        raise RuntimeError(
+            f"'{alias}' is a plain collection, not an alias. Re-run with adopt_legacy=True (--adopt-legacy) to "
+            "replace it with an alias; points not in the chunk store (e.g. pre-store ingests) will be dropped."
+        )
+
+    dim = _detect_embedding_dimension(embeddings)
+    target = target or f"{alias}_{time.strftime('%Y%m%d%H%M%S')}"
+    if client.collection_exists(target):
+        raise RuntimeError(f"Target collection '{target}' already exists")
+    client.create_collection(collection_name=target, vectors_config=VectorParams(size=dim, distance=Distance.COSINE))
+
+    started = time.perf_counter()
+    copied: Set[str] = set()
+    done = 0
+
+    def copy_since(since: Optional[float]) -> float:
+        # Returns the start time of this pass: the next pass picks up anything stored from then on
+        nonlocal done
+        pass_started = time.time()
+        for batch in store.iter_batches(alias, batch_size, since=since):
+            vectors = embeddings.embed_documents([text for _, text, _ in batch])
+            client.upsert(
+                collection_name=target,
+                points=[
+                    PointStruct(id=chunk_id, vector=vector, payload={CONTENT_KEY: text, METADATA_KEY: meta})
+                    for (chunk_id, text, meta), vector in zip(batch, vectors)
+                ],
+            )
+            copied.update(chunk_id for chunk_id, _, _ in batch)
+            done += len(batch)
+            if progress is not None:
+                progress(done, max(total, done))
+        return pass_started
+
+    # Full pass, then a (short) catch-up pass for chunks ingested during the full pass
+    mark = copy_since(copy_since(None))
+
+    if legacy:
+        # A collection and an alias cannot share a name: this is the only non-atomic step
+        client.delete_collection(alias)
+    ops = []
+    if previous is not None:
+        ops.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+    ops.append(CreateAliasOperation(create_alias=CreateAlias(collection_name=target, alias_name=alias)))
+    client.update_collection_aliases(change_aliases_operations=ops)
+    # Ingests that landed in the old collection during the catch-up pass or the switch
+    copy_since(mark)
+    removed = sorted(copied - store.ids(alias))
+    if removed:
+        client.delete(collection_name=target, points_selector=PointIdsList(points=removed))
+
+    if drop_old and previous is not None:
+        client.delete_collection(previous)
+    elapsed = time.perf_counter() - started
+    try:
+        print(f"[reindex] alias='{alias}' {previous or alias} -> {target} chunks={len(copied) - len(removed)} dim={dim} elapsed={elapsed:.1f}s")
+    except Exception:
+        pass
+    return {"alias": alias, "previous": previous, "collection": target, "num_chunks": len(copied) - len(removed), "dimension": dim}
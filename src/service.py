@@ -0,0 +1,231 @@
+"""Headless HTTP service around the router graph.
+
+Run locally with `python -m src.service --port 8000` (or `uvicorn src.service:app`).
+One compiled graph and its shared clients are built at startup and reused by
+every request; a semaphore caps in-flight graph runs and each run is bounded by
+SERVICE_REQUEST_TIMEOUT_S.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+from pydantic import BaseModel
+
+try:
+    from src.admission import BackendBusy, backend_stats, deadline_scope
+    from src.config import get_settings
+    from src.graph import build_graph
+    from src.providers import router_stats
+    from src.startup import prewarm, should_prewarm
+except Exception:
+    from admission import BackendBusy, backend_stats, deadline_scope
+    from config import get_settings
+    from graph import build_graph
+    from providers import router_stats
+    from startup import prewarm, should_prewarm
+
+
+class AskRequest(BaseModel):
+    question: str
+    file_sha256: Optional[str] = None
+
+    def graph_input(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {"question": self.question}
+        if self.file_sha256:
+            state["file_sha256"] = self.file_sha256
+        return state
+
+
+class IngestRequest(BaseModel):
+    path: str
+    collection: Optional[str] = None
+
+
+def _to_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    response = {
+        "answer": result.get("answer", ""),
+        "route": result.get("route"),
+        "sources": result.get("sources", []),
+    }
+    if "weather" in result:
+        response["weather"] = result["weather"]
+    if result.get("provider"):
+        response["provider"] = result["provider"]
+    return response
+
+
+def _resolve_ingest_path(path: str, ingest_dir: str) -> str:
+    """Resolve `path` (relative to `ingest_dir`, or absolute) to a PDF inside `ingest_dir`, or raise 4xx."""
+    root = os.path.realpath(ingest_dir)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise HTTPException(status_code=403, detail=f"Only files under {ingest_dir} can be ingested")
+    if not resolved.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Only PDF files can be ingested")
+    if not os.path.isfile(resolved):
+        raise HTTPException(status_code=404, detail="File not found")
+    return resolved
+
+
+class _SlotStreamingResponse(StreamingResponse):
+    """Streaming response that frees its concurrency slot when the response ends, even if the body never started."""
+
+    def __init__(self, content, release, **kwargs) -> None:
+        super().__init__(content, **kwargs)
+        self._release = release
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._release()
+
+
+def _busy(exc: BackendBusy) -> HTTPException:
+    # Fast load-shed: the backend queue is full or cannot serve before the deadline
+    return HTTPException(
+        status_code=503, detail=str(exc), headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    )
+
+
+def create_app(graph=None, job_manager=None) -> FastAPI:
+    """Build the ASGI app; `graph`/`job_manager` may be injected (tests, load stand-ins)."""
+    settings = get_settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Build once, off the event loop: provider clients are created here, not per request
+        app.state.graph = graph if graph is not None else await asyncio.to_thread(build_graph)
+        if graph is None and should_prewarm():
+            await asyncio.to_thread(prewarm)
+        app.state.limiter = asyncio.Semaphore(max(1, settings.service_max_concurrency))
+        app.state.in_flight = 0
+        yield
+
+    app = FastAPI(title="AI Pipeline: Weather + RAG", lifespan=lifespan)
+
+    def _jobs():
+        nonlocal job_manager
+        if job_manager is None:
+            try:
+                from src.jobs import get_job_manager
+            except Exception:
+                from jobs import get_job_manager
+            job_manager = get_job_manager()
+        return job_manager
+
+    async def _acquire() -> None:
+        try:
+            await asyncio.wait_for(app.state.limiter.acquire(), timeout=settings.service_queue_timeout_s)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Server busy, retry later", headers={"Retry-After": "1"})
+        app.state.in_flight += 1
+
+    def _release() -> None:
+        app.state.in_flight -= 1
+        app.state.limiter.release()
+
+    @app.get("/healthz")
+    async def healthz() -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "graph_ready": getattr(app.state, "graph", None) is not None,
+            "in_flight": getattr(app.state, "in_flight", 0),
+            "max_concurrency": settings.service_max_concurrency,
+            "providers": router_stats(),
+            "backends": backend_stats(),
+        }
+
+    @app.post("/ask")
+    async def ask(req: AskRequest) -> Dict[str, Any]:
+        await _acquire()
+        started = time.perf_counter()
+        try:
+            # Sync graph nodes run in the default executor; a timed-out run is abandoned, not killed.
+            # Backend queues inherit the request deadline, so they shed instead of outliving it.
+            with deadline_scope(settings.service_request_timeout_s):
+                result = await asyncio.wait_for(
+                    app.state.graph.ainvoke(req.graph_input()),
+                    timeout=settings.service_request_timeout_s,
+                )
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Timed out answering the question")
+        except BackendBusy as exc:
+            raise _busy(exc)
+        finally:
+            _release()
+        response = _to_response(result if isinstance(result, dict) else {})
+        response["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return response
+
+    @app.post("/ask/stream")
+    async def ask_stream(req: AskRequest) -> StreamingResponse:
+        await _acquire()
+
+        async def events() -> AsyncIterator[str]:
+            deadline = time.monotonic() + settings.service_request_timeout_s
+            updates = app.state.graph.astream(req.graph_input(), stream_mode="updates")
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    try:
+                        with deadline_scope(remaining):
+                            update = await asyncio.wait_for(updates.__anext__(), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+                    for node, output in (update or {}).items():
+                        payload = {"node": node, **_to_response(output or {})}
+                        yield f"event: update\ndata: {json.dumps(payload, default=str)}\n\n"
+                yield "event: end\ndata: {}\n\n"
+            except asyncio.TimeoutError:
+                yield f"event: error\ndata: {json.dumps({'detail': 'Timed out answering the question'})}\n\n"
+            except BackendBusy as exc:
+                yield f"event: error\ndata: {json.dumps({'detail': str(exc), 'retry_after': exc.retry_after})}\n\n"
+            finally:
+                await updates.aclose()
+
+        return _SlotStreamingResponse(events(), _release, media_type="text/event-stream")
+
+    @app.post("/ingest", status_code=202)
+    async def ingest(req: IngestRequest) -> Dict[str, Any]:
+        path = _resolve_ingest_path(req.path, settings.service_ingest_dir)
+        job_id = await asyncio.to_thread(_jobs().submit, path, req.collection)
+        return {"job_id": job_id}
+
+    @app.get("/ingest/{job_id}")
+    async def ingest_status(job_id: str) -> Dict[str, Any]:
+        job = await asyncio.to_thread(_jobs().get_job, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown job id")
+        return job
+
+    return app
+
+
+app = create_app()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local dev server for the router graph service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--reload", action="store_true")
+    args = parser.parse_args()
+    uvicorn.run("src.service:app", host=args.host, port=args.port, reload=args.reload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Cold-start helpers: per-module import cost report and optional pre-warming.
+
+    python -m src.startup --report                 # what `import src.graph` costs
+    python -m src.startup --report --module src.service
+    python -m src.startup --warm                   # build clients now and time each step
+"""
+
+import argparse
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from src.config import get_settings
+except Exception:
+    from config import get_settings
+
+
+def import_report(module: str = "src.graph") -> List[Dict[str, Any]]:
+    """Import `module` in a fresh interpreter with `-X importtime` and aggregate by top-level package.
+
+    Returns rows sorted by self time: `{"package", "self_ms", "modules"}`, plus the
+    total wall time of the import as a `"<total>"` row first.
+    """
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    per_package: Dict[str, Dict[str, Any]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  <self us> | <cumulative us> | <indented module name>"
+        try:
+            self_us, _cumulative_us, name = [p.strip() for p in line.split(":", 1)[1].split("|")]
+            self_us_value = int(self_us)
+        except ValueError:
+            continue
+        package = name.split(".")[0]
+        row = per_package.setdefault(package, {"package": package, "self_ms": 0.0, "modules": 0})
+        row["self_ms"] += self_us_value / 1000
+        row["modules"] += 1
+
+    rows = sorted(per_package.values(), key=lambda r: r["self_ms"], reverse=True)
+    return [{"package": "<total>", "self_ms": wall_ms, "modules": sum(r["modules"] for r in rows)}] + rows
+
+
+def _prewarm_steps() -> List[Tuple[str, Callable[[], Any]]]:
+    try:
+        from src.embeddings import get_embeddings
+        from src.llm import get_llm
+        from src.vectorstore import get_qdrant_client
+    except Exception:
+        from embeddings import get_embeddings
+        from llm import get_llm
+        from vectorstore import get_qdrant_client
+
+    def _graph_modules() -> None:
+        import langgraph.graph  # noqa: F401
+
+    def _ingest_modules() -> None:
+        import langchain.text_splitter  # noqa: F401
+        import pypdf  # noqa: F401
+
+    return [
+        ("langgraph", _graph_modules),
+        ("qdrant_client", get_qdrant_client),
+        ("embeddings", get_embeddings),
+        ("llm", get_llm),
+        ("ingest_modules", _ingest_modules),
+    ]
+
+
+# What an ingest worker needs before its first job (plus "llm" when summaries are built)
+INGEST_PREWARM_STEPS = ("qdrant_client", "embeddings", "ingest_modules")
+
+
+def prewarm(only: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Import provider modules and build the shared clients ahead of the first request.
+
+    `only` limits the work to the named steps. Each step is timed; failures are
+    recorded rather than raised so a missing key never blocks startup (the
+    request path will surface the error as before).
+    """
+    wanted = set(only) if only is not None else None
+    timings: Dict[str, Any] = {}
+    for name, step in _prewarm_steps():
+        if wanted is not None and name not in wanted:
+            continue
+        started = time.perf_counter()
+        try:
+            step()
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+        except Exception as exc:
+            timings[name] = f"failed: {exc}"
+    try:
+        print(f"[startup] prewarm {timings}")
+    except Exception:
+        pass
+    return timings
+
+
+def prewarm_in_background(only: Optional[Iterable[str]] = None) -> threading.Thread:
+    """Run `prewarm(only)` on a daemon thread, e.g. while an ingest worker waits for its first job."""
+    thread = threading.Thread(target=prewarm, args=(only,), name="prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def should_prewarm() -> bool:
+    return get_settings().startup_prewarm.strip().lower() in ("1", "true", "yes", "on")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and reduce cold-start cost")
+    parser.add_argument("--report", action="store_true", help="Print per-package import cost")
+    parser.add_argument("--module", default="src.graph", help="Module to import for --report")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--warm", action="store_true", help="Build shared clients now and time each step")
+    args = parser.parse_args()
+    if not (args.report or args.warm):
+        parser.error("pass --report and/or --warm")
+
+    if args.report:
+        rows = import_report(args.module)
+        print(f"import {args.module}: {rows[0]['self_ms']:.0f} ms wall, {rows[0]['modules']} modules")
+        for row in rows[1 : args.top + 1]:
+            print(f"  {row['package']:<32} {row['self_ms']:>9.1f} ms  ({row['modules']} modules)")
+    if args.warm:
+        for name, value in prewarm().items():
+            print(f"  {name:<16} {value if isinstance(value, str) else f'{value:.1f} ms'}")
+
+
+if __name__ == "__main__":
+    main()
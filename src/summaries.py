@@ -0,0 +1,425 @@
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+try:
+    from src.admission import map_in_context, wait_while_busy
+    from src.config import get_settings
+    from src.llm import build_answer_prompt, format_output, get_llm
+except Exception:
+    from admission import map_in_context, wait_while_busy
+    from config import get_settings
+    from llm import build_answer_prompt, format_output, get_llm
+
+
+SUMMARY_NODE = "summary"
+PAGE = "page"
+SECTION = "section"
+DOCUMENT = "document"
+LEVELS = (PAGE, SECTION, DOCUMENT)
+
+# (what is being summarized, text) -> summary
+Summarizer = Callable[[str, str], str]
+
+_NAMED_HEADINGS = (
+    "abstract",
+    "introduction",
+    "background",
+    "related work",
+    "method",
+    "methods",
+    "methodology",
+    "experiments",
+    "evaluation",
+    "results",
+    "discussion",
+    "limitations",
+    "future work",
+    "conclusion",
+    "conclusions",
+    "acknowledgements",
+    "acknowledgments",
+    "appendix",
+    "references",
+    "bibliography",
+)
+# Not worth summarizing: reference lists read as noise in section/document summaries
+_SKIPPED_SECTIONS = ("references", "bibliography", "acknowledgements", "acknowledgments")
+
+_NUMBERED_HEADING = re.compile(r"^(?:(?:Section|SECTION|Chapter|CHAPTER|Part|PART)\s+)?(\d{1,2})\.?\s+([A-Z][^\n]{1,78})$")
+_SUMMARY_QUESTION = re.compile(r"\b(summari[sz]e|summary|overview|tl;?dr|gist|outline|main points|key points)\b", re.I)
+_PAGE_REF = re.compile(r"\bpage\s+(\d+)\b", re.I)
+_SECTION_REF = re.compile(r"\b(?:section|chapter|part)\s+(\d+)\b", re.I)
+_NAMED_REF = re.compile(r"\b(" + "|".join(h.replace(" ", r"\s+") for h in _NAMED_HEADINGS) + r")\b", re.I)
+_DOCUMENT_REF = re.compile(r"\b(document|pdf|paper|file|report|book|whole|entire|overall)\b", re.I)
+
+
+@dataclass(frozen=True)
+class Section:
+    number: Optional[str]
+    title: str
+    start_page: int
+    end_page: int
+    text: str
+
+    @property
+    def key(self) -> str:
+        return " ".join(self.title.lower().rstrip(":").split())
+
+    @property
+    def heading(self) -> str:
+        return f"Section {self.number}: {self.title}" if self.number else self.title
+
+
+def summaries_enabled() -> bool:
+    return get_settings().ingest_summaries.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _heading(line: str, expected: int) -> Optional[Tuple[Optional[str], str]]:
+    if not line or len(line) > 80:
+        return None
+    if line.rstrip(":").strip().lower() in _NAMED_HEADINGS:
+        return None, line.rstrip(":").strip()
+    match = _NUMBERED_HEADING.match(line)
+    if match is None:
+        return None
+    number, title = match.group(1), match.group(2).strip()
+    # Only the next top-level number counts, and list items ("1. Install the ...") read as sentences
+    if int(number) != expected or len(title.split()) > 8 or title[-1] in ".,;":
+        return None
+    return number, title.rstrip(":")
+
+
+def detect_sections(pages: List[str], pages_per_window: int = 5) -> List[Section]:
+    """Split page texts into sections at headings such as "2 Methods", "Chapter 3 ..." or "Introduction".
+
+    Text before the first heading becomes "Front matter". PDFs without
+    recognizable headings are split into windows of `pages_per_window` pages.
+    """
+    sections: List[Section] = []
+    current: Tuple[Optional[str], str, int] = (None, "Front matter", 0)
+    lines: List[str] = []
+    end_page = 0
+    expected = 1
+    found = False
+
+    def flush() -> None:
+        text = "\n".join(lines).strip()
+        if text:
+            sections.append(Section(current[0], current[1], current[2], end_page, text))
+
+    for page_no, page_text in enumerate(pages):
+        for line in (page_text or "").splitlines():
+            heading = _heading(line.strip(), expected)
+            if heading is None:
+                lines.append(line)
+                end_page = page_no
+                continue
+            flush()
+            found = True
+            current, lines, end_page = (heading[0], heading[1], page_no), [], page_no
+            if heading[0] is not None:
+                expected = int(heading[0]) + 1
+    flush()
+
+    if found:
+        return sections
+    step = max(1, pages_per_window)
+    windows = []
+    for start in range(0, len(pages), step):
+        end = min(len(pages), start + step) - 1
+        text = "\n".join(p or "" for p in pages[start : end + 1]).strip()
+        if text:
+            windows.append(Section(None, f"Pages {start + 1}-{end + 1}", start, end, text))
+    return windows
+
+
+def llm_summarizer() -> Summarizer:
+    llm = get_llm()
+    prompt = build_answer_prompt(
+        "You write faithful, concise summaries of PDF excerpts. Cover the main points and do not add facts."
+    )
+
+    def summarize(what: str, text: str) -> str:
+        # Summaries are built by ingest jobs, which wait for a busy LLM instead of failing
+        question = f"Summarize {what} in 3-5 sentences."
+        return format_output(wait_while_busy(lambda: (prompt | llm).invoke({"context": text, "question": question})))
+
+    return summarize
+
+
+def summarize_long(summarize: Summarizer, what: str, text: str, max_chars: int) -> str:
+    """Summarize `text`, map-reducing over `max_chars` pieces when it does not fit one call."""
+    text = text.strip()
+    max_chars = max(1000, max_chars)
+    if len(text) <= max_chars:
+        return summarize(what, text)
+    pieces = [text[i : i + max_chars] for i in range(0, len(text), max_chars)]
+    partial = "\n\n".join(summarize(f"part {n} of {len(pieces)} of {what}", p) for n, p in enumerate(pieces, 1))
+    if len(partial) >= len(text):
+        partial = partial[:max_chars]
+    return summarize_long(summarize, what, partial, max_chars)
+
+
+def _levels(levels: Optional[List[str]]) -> List[str]:
+    if levels is None:
+        levels = [lvl.strip().lower() for lvl in get_settings().summary_levels.split(",") if lvl.strip()]
+    unknown = [lvl for lvl in levels if lvl not in LEVELS]
+    if unknown:
+        raise ValueError(f"Unknown summary level(s) in SUMMARY_LEVELS: {', '.join(unknown)}")
+    return levels
+
+
+def build_summary_nodes(
+    pages: List[Document],
+    levels: Optional[List[str]] = None,
+    summarize: Optional[Summarizer] = None,
+) -> List[Document]:
+    """Summarize a PDF's pages, sections and the whole document into retrievable summary nodes.
+
+    `pages` are the per-page Documents from `load_pdf`. Sections are summarized
+    from their own text and the document from the section summaries (or page
+    summaries when sections are disabled), so each level costs about one LLM
+    call per node. Node metadata carries `node_type="summary"` and `level`.
+    """
+    if not pages:
+        return []
+    settings = get_settings()
+    levels = _levels(levels)
+    summarize = summarize or llm_summarizer()
+    max_chars = settings.summary_max_input_chars
+    base = {
+        "node_type": SUMMARY_NODE,
+        "source": pages[0].metadata.get("source"),
+        "file_sha256": pages[0].metadata.get("file_sha256"),
+        "total_pages": len(pages),
+    }
+    texts = [p.page_content for p in pages]
+    nodes: List[Document] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.summary_workers), thread_name_prefix="summaries") as pool:
+        page_summaries: List[Tuple[int, str]] = []
+        if PAGE in levels:
+            numbered = [(i, t) for i, t in enumerate(texts) if t.strip()]
+            results = map_in_context(
+                pool, lambda item: summarize_long(summarize, f"page {item[0] + 1}", item[1], max_chars), numbered
+            )
+            page_summaries = [(i, s) for (i, _), s in zip(numbered, results)]
+            for i, summary in page_summaries:
+                nodes.append(
+                    Document(
+                        page_content=f"Page {i + 1}\n\n{summary}",
+                        metadata={**base, "level": PAGE, "page": i, "start_page": i, "end_page": i},
+                    )
+                )
+
+        section_summaries: List[Tuple[Section, str]] = []
+        if SECTION in levels:
+            sections = [
+                s for s in detect_sections(texts, settings.summary_pages_per_section) if s.key not in _SKIPPED_SECTIONS
+            ]
+            results = map_in_context(
+                pool, lambda s: summarize_long(summarize, f"the section '{s.heading}'", s.text, max_chars), sections
+            )
+            section_summaries = list(zip(sections, results))
+            for section, summary in section_summaries:
+                nodes.append(
+                    Document(
+                        page_content=f"{section.heading}\n\n{summary}",
+                        metadata={
+                            **base,
+                            "level": SECTION,
+                            "section": section.number,
+                            "section_title": section.title,
+                            "section_key": section.key,
+                            "start_page": section.start_page,
+                            "end_page": section.end_page,
+                        },
+                    )
+                )
+
+    if DOCUMENT in levels:
+        if section_summaries:
+            material = "\n\n".join(f"{s.heading}: {summary}" for s, summary in section_summaries)
+        elif page_summaries:
+            material = "\n\n".join(f"Page {i + 1}: {summary}" for i, summary in page_summaries)
+        else:
+            material = "\n\n".join(texts)
+        if material.strip():
+            summary = summarize_long(summarize, "the whole document", material, max_chars)
+            nodes.append(
+                Document(
+                    page_content=f"Document summary\n\n{summary}",
+                    metadata={**base, "level": DOCUMENT, "start_page": 0, "end_page": len(pages) - 1},
+                )
+            )
+    return nodes
+
+
+def summary_node_ids(file_hash: str, nodes: List[Document]) -> List[str]:
+    # Deterministic like chunk ids, so rebuilding a file's summaries overwrites them
+    ids = []
+    for node in nodes:
+        meta = node.metadata
+        key = f"{meta['level']}:{meta.get('start_page')}:{meta.get('section_title', '')}"
+        ids.append(str(uuid.uuid5(uuid.NAMESPACE_URL, f"{file_hash}:{SUMMARY_NODE}:{key}")))
+    return ids
+
+
+def is_summary_question(question: str) -> bool:
+    return bool(_SUMMARY_QUESTION.search(question or ""))
+
+
+def chunks_only_filter():
+    """Qdrant filter excluding summary nodes, for ordinary chunk retrieval."""
+    from qdrant_client.http import models
+
+    return models.Filter(
+        must_not=[models.FieldCondition(key="metadata.node_type", match=models.MatchValue(value=SUMMARY_NODE))]
+    )
+
+
+def _summary_filters(question: str, file_sha256: Optional[str] = None) -> List[Tuple[Any, bool]]:
+    """`(qdrant filter, generic)` pairs to try for a summary question, most specific first.
+
+    A question naming a page or section only gets filters for that reference,
+    so a missing node means "no summary" rather than some other section's.
+    The generic nearest-section fallback is used only without a reference.
+    """
+    from qdrant_client.http import models
+
+    def only(*conditions) -> Any:
+        node = models.FieldCondition(key="metadata.node_type", match=models.MatchValue(value=SUMMARY_NODE))
+        if file_sha256:
+            file = models.FieldCondition(key="metadata.file_sha256", match=models.MatchValue(value=file_sha256))
+            conditions += (file,)
+        return models.Filter(must=[node, *conditions])
+
+    def level(*names: str) -> Any:
+        return models.FieldCondition(key="metadata.level", match=models.MatchAny(any=list(names)))
+
+    filters = []
+    page = _PAGE_REF.search(question)
+    section = _SECTION_REF.search(question)
+    named = _NAMED_REF.search(question)
+    if page:
+        page_index = models.FieldCondition(key="metadata.page", match=models.MatchValue(value=int(page.group(1)) - 1))
+        filters.append((only(level(PAGE), page_index), False))
+    if section:
+        number = models.FieldCondition(key="metadata.section", match=models.MatchValue(value=section.group(1)))
+        filters.append((only(level(SECTION), number), False))
+    if named:
+        word = " ".join(named.group(1).lower().split())
+        variants = sorted({word, word.rstrip("s"), word.rstrip("s") + "s"})
+        section_key = models.FieldCondition(key="metadata.section_key", match=models.MatchAny(any=variants))
+        filters.append((only(level(SECTION), section_key), False))
+    if filters:
+        return filters
+    if _DOCUMENT_REF.search(question):
+        filters.append((only(level(DOCUMENT)), False))
+    filters.append((only(level(SECTION, DOCUMENT)), True))
+    return filters
+
+
+def _other_file_matches(vs, qdrant_filter, file_sha256: Optional[str]) -> bool:
+    from qdrant_client.http import models
+
+    other = models.FieldCondition(key="metadata.file_sha256", match=models.MatchValue(value=file_sha256 or ""))
+    points, _ = vs.client.scroll(
+        vs.collection_name,
+        scroll_filter=models.Filter(must=qdrant_filter.must, must_not=[other]),
+        limit=1,
+        with_payload=False,
+        with_vectors=False,
+    )
+    return bool(points)
+
+
+def _closest_file(vs, vector: List[float]) -> Optional[str]:
+    """`file_sha256` of the PDF chunk closest to the question: the file a summary question is most likely about."""
+    from qdrant_client.http import models
+
+    pdf_chunks = models.Filter(
+        must_not=[
+            models.FieldCondition(key="metadata.node_type", match=models.MatchValue(value=SUMMARY_NODE)),
+            models.IsEmptyCondition(is_empty=models.PayloadField(key="metadata.file_sha256")),
+        ]
+    )
+    res = vs.client.query_points(
+        vs.collection_name, query=vector, query_filter=pdf_chunks, limit=1, with_payload=True, with_vectors=False
+    )
+    if not res.points:
+        return None
+    return ((res.points[0].payload or {}).get("metadata") or {}).get("file_sha256")
+
+
+# collection -> (has summary nodes, checked at); "no" is re-checked after _PRESENCE_TTL_S, "yes" is kept
+_PRESENCE: Dict[str, Tuple[bool, float]] = {}
+_PRESENCE_LOCK = threading.Lock()
+_PRESENCE_TTL_S = 60.0
+
+
+def summaries_available(vs) -> bool:
+    """Whether the collection holds any summary node, so summary mode costs nothing when none were ingested."""
+    from qdrant_client.http import models
+
+    now = time.monotonic()
+    with _PRESENCE_LOCK:
+        cached = _PRESENCE.get(vs.collection_name)
+    if cached is not None and (cached[0] or now - cached[1] < _PRESENCE_TTL_S):
+        return cached[0]
+    nodes = models.Filter(
+        must=[models.FieldCondition(key="metadata.node_type", match=models.MatchValue(value=SUMMARY_NODE))]
+    )
+    points, _ = vs.client.scroll(
+        vs.collection_name, scroll_filter=nodes, limit=1, with_payload=False, with_vectors=False
+    )
+    with _PRESENCE_LOCK:
+        _PRESENCE[vs.collection_name] = (bool(points), now)
+    return bool(points)
+
+
+def note_summaries_stored(collection: str) -> None:
+    # Lets a process that just ingested summaries use them without waiting out a cached "no"
+    with _PRESENCE_LOCK:
+        _PRESENCE[collection] = (True, time.monotonic())
+
+
+def answer_from_summaries(question: str, vs, file_sha256: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Answer a summary-style question from the best precomputed summary node, or None if there is none.
+
+    Explicit references ("page 3", "section 2", "the introduction") are matched
+    on node metadata only; otherwise the closest document (for "the document")
+    or section summary is used if it scores at least SUMMARY_MIN_SCORE.
+    Without `file_sha256` the lookup is scoped to the file of the PDF chunk
+    closest to the question; if that cannot be determined it gives up when
+    nodes of more than one PDF match, since "section 2" is ambiguous then.
+    """
+    vector = vs.embeddings.embed_query(question)
+    file_sha256 = file_sha256 or _closest_file(vs, vector)
+    min_score = get_settings().summary_min_score
+    for qdrant_filter, generic in _summary_filters(question, file_sha256):
+        # query_points directly: one embedding for every filter tried
+        res = vs.client.query_points(
+            vs.collection_name,
+            query=vector,
+            query_filter=qdrant_filter,
+            score_threshold=min_score if generic else None,
+            limit=1,
+            with_payload=True,
+            with_vectors=False,
+        )
+        if not res.points:
+            continue
+        payload = res.points[0].payload or {}
+        metadata = payload.get("metadata", {})
+        if file_sha256 is None and _other_file_matches(vs, qdrant_filter, metadata.get("file_sha256")):
+            return None
+        return {"answer": payload.get("page_content", ""), "sources": [metadata]}
+    return None
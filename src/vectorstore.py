@@ -1,19 +1,63 @@
-from typing import Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 import os
 import re
+import threading
 
-from langchain_qdrant import Qdrant
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
-
+from .admission import admit
 from .config import get_settings
 
+if TYPE_CHECKING:
+    from langchain_qdrant import Qdrant
+    from qdrant_client import QdrantClient
+
+# qdrant_client/langchain_qdrant are imported on first use: they dominate import time
+
+
+_CACHED_CLIENT: QdrantClient | None = None
+_CLIENT_LOCK = threading.Lock()
+# Data-plane calls that go through the "qdrant" admission backend; collection management does not
+_ADMITTED_METHODS = ("search", "query_points", "query_batch_points", "upsert", "delete", "scroll", "retrieve", "count")
+
+
+def _admitted_client_class(base: type) -> type:
+    """Subclass of QdrantClient (langchain_qdrant requires one) whose data-plane calls are admission-controlled."""
+
+    def wrap(name: str):
+        method = getattr(base, name)
+
+        def admitted(self, *args, **kwargs):
+            return admit("qdrant", lambda: method(self, *args, **kwargs))
+
+        admitted.__name__ = name
+        admitted.__doc__ = method.__doc__
+        return admitted
+
+    return type("AdmittedQdrantClient", (base,), {n: wrap(n) for n in _ADMITTED_METHODS if hasattr(base, n)})
+
+
+# (collection, id(embeddings)) -> embeddings, for collections already checked against that embeddings instance
+_VERIFIED_COLLECTIONS: Dict[Tuple[str, int], Any] = {}
+
 
 def get_qdrant_client() -> QdrantClient:
-    settings = get_settings()
-    if settings.qdrant_api_key:
-        return QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key, timeout=30)
-    return QdrantClient(url=settings.qdrant_url, timeout=30)
+    """Return a shared Qdrant client; its HTTP connection pool is reused across calls.
+
+    Searches, upserts and deletes are admission-controlled (QDRANT_* limits).
+    """
+    global _CACHED_CLIENT
+    with _CLIENT_LOCK:
+        if _CACHED_CLIENT is None:
+            from qdrant_client import QdrantClient
+
+            client_cls = _admitted_client_class(QdrantClient)
+            settings = get_settings()
+            if settings.qdrant_api_key:
+                _CACHED_CLIENT = client_cls(url=settings.qdrant_url, api_key=settings.qdrant_api_key, timeout=30)
+            else:
+                _CACHED_CLIENT = client_cls(url=settings.qdrant_url, timeout=30)
+    return _CACHED_CLIENT
 
 
 def ensure_qdrant_ready(client: QdrantClient) -> None:
@@ -28,7 +72,20 @@ def ensure_qdrant_ready(client: QdrantClient) -> None:
         ) from exc
 
 
+def resolve_alias(client: QdrantClient, alias: str) -> Optional[str]:
+    """Return the collection `alias` currently points to, or None if it is not an alias."""
+    for item in client.get_aliases().aliases:
+        if item.alias_name == alias:
+            return item.collection_name
+    return None
+
+
 def ensure_collection(client: QdrantClient, collection_name: str, vector_size: int | None = None) -> None:
+    """Create `collection_name` if it does not exist yet (as a collection or an alias).
+
+    New collections are created as `<name>_v1` behind an alias `<name>`, so the
+    first `src.reindex` migration switches the alias without deleting anything.
+    """
     exists = False
     try:
         info = client.get_collection(collection_name)
@@ -38,10 +95,27 @@ def ensure_collection(client: QdrantClient, collection_name: str, vector_size: i
         exists = False
 
     if not exists and vector_size is not None:
-        client.create_collection(
-            collection_name=collection_name,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-        )
+        from qdrant_client.http.models import CreateAlias, CreateAliasOperation, Distance, VectorParams
+
+        backing = f"{collection_name}_v1"
+        try:
+            client.create_collection(
+                collection_name=backing,
+                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+            )
+        except Exception:
+            # Another process may have won the race to create it
+            if not client.collection_exists(backing):
+                raise
+        try:
+            client.update_collection_aliases(
+                change_aliases_operations=[
+                    CreateAliasOperation(create_alias=CreateAlias(collection_name=backing, alias_name=collection_name))
+                ]
+            )
+        except Exception:
+            if resolve_alias(client, collection_name) is None:
+                raise
 
 
 def _get_existing_vector_size(client: QdrantClient, collection_name: str) -> int | None:
@@ -63,6 +137,24 @@ def _get_existing_vector_size(client: QdrantClient, collection_name: str) -> int
     return None
 
 
+def build_search_params(
+    hnsw_ef: Optional[int] = None, rescore: Optional[bool] = None, oversampling: Optional[float] = None
+):
+    """Return Qdrant SearchParams for the given knobs, or None to use server defaults.
+
+    Unset/zero values mean "server default"; `rescore`/`oversampling` only affect
+    collections with quantization enabled.
+    """
+    if not hnsw_ef and rescore is None and not oversampling:
+        return None
+    from qdrant_client.http.models import QuantizationSearchParams, SearchParams
+
+    quantization = None
+    if rescore is not None or oversampling:
+        quantization = QuantizationSearchParams(rescore=rescore, oversampling=oversampling or None)
+    return SearchParams(hnsw_ef=hnsw_ef or None, quantization=quantization)
+
+
 def _detect_embedding_dimension(embeddings) -> int:
     """Best-effort detection of embedding vector dimension by probing a single query."""
     try:
@@ -79,7 +171,27 @@ def get_vectorstore(embeddings, collection_name: Optional[str] = None) -> Qdrant
     settings = get_settings()
     collection = collection_name or settings.qdrant_collection
     client = get_qdrant_client()
-    ensure_qdrant_ready(client)
+    verified_key = (collection, id(embeddings))
+    if verified_key not in _VERIFIED_COLLECTIONS:
+        ensure_qdrant_ready(client)
+        _verify_collection(client, collection, embeddings)
+        _VERIFIED_COLLECTIONS[verified_key] = embeddings
+    # Ensure event loop exists for async paths used by vectorstore
+    try:
+        import asyncio
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+    except Exception:
+        pass
+    from langchain_qdrant import Qdrant
+
+    return Qdrant(client=client, collection_name=collection, embeddings=embeddings)
+
+
+def _verify_collection(client: QdrantClient, collection: str, embeddings) -> None:
     # Ensure collection exists with the correct dimension for the active embeddings
     try:
         dim = _detect_embedding_dimension(embeddings)
@@ -88,14 +200,12 @@ def get_vectorstore(embeddings, collection_name: Optional[str] = None) -> Qdrant
         if isinstance(existing, int) and existing != dim:
             # Optionally auto-recreate on mismatch to avoid 400 errors
             if os.getenv("QDRANT_AUTO_RECREATE", "").strip().lower() == "true":
+                # Deleting the backing collection drops its alias; recreate both
                 try:
-                    client.delete_collection(collection)
+                    client.delete_collection(resolve_alias(client, collection) or collection)
                 except Exception:
                     pass
-                client.create_collection(
-                    collection_name=collection,
-                    vectors_config=VectorParams(size=dim, distance=Distance.COSINE),
-                )
+                ensure_collection(client, collection, vector_size=dim)
             else:
                 raise RuntimeError(
                     f"Qdrant collection '{collection}' has dimension {existing}, but embeddings produce {dim}. "
@@ -104,16 +214,3 @@ def get_vectorstore(embeddings, collection_name: Optional[str] = None) -> Qdrant
                 )
     except Exception:
         pass
-    # Ensure event loop exists for async paths used by vectorstore
-    try:
-        import asyncio
-        try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-    except Exception:
-        pass
-    return Qdrant(client=client, collection_name=collection, embeddings=embeddings)
-
-
@@ -1,13 +1,21 @@
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import requests
 import re
 
 try:
+    from src.admission import admit, map_in_context
     from src.config import get_settings
-    from src.llm import build_llm, build_answer_prompt, format_output
+    from src.gazetteer import get_gazetteer
+    from src.llm import get_llm, build_answer_prompt, format_output
 except Exception:
+    from admission import admit, map_in_context
     from config import get_settings
-    from llm import build_llm, build_answer_prompt, format_output
+    from gazetteer import get_gazetteer
+    from llm import get_llm, build_answer_prompt, format_output
 
 
 def _sanitize_city_name(city: str) -> str:
@@ -19,32 +27,173 @@ def _sanitize_city_name(city: str) -> str:
     return " ".join(tokens)
 
 
+_CITY_SEPARATORS = re.compile(r"\s*(,|;|&|\band\b|\bor\b|\bvs\.?|\bversus\b)\s*", re.IGNORECASE)
+
+
+def _is_qualifier(gazetteer, place: str, part: str) -> bool:
+    # "Paris, FR" / "Paris, France" / "Austin, Texas": the part after the comma narrows the place down
+    if not part or gazetteer.lookup(f"{place}, {part}") is not None:
+        return bool(part)
+    return gazetteer.region_country(part) is not None and gazetteer.lookup(part) is None
+
+
+def extract_cities(question: str) -> List[str]:
+    """Extract one or more city names from e.g. "weather in Paris, Berlin and Rome today?".
+
+    Known cities are resolved against the bundled gazetteer (longest match, aliases
+    such as "NYC" or "Bombay") and returned under their canonical name. The text
+    after the first " in " is split on commas/"and"/"or"/"&", except that a country
+    or state after a comma qualifies the preceding city ("Paris, France"); parts
+    the gazetteer does not know are kept as typed (minus temporal stopwords) for a
+    name lookup.
+    Without an " in " clause, capitalized gazetteer names anywhere in the question are used.
+    """
+    gazetteer = get_gazetteer()
+    match = re.search(r"\bin\s+(.+)$", question, re.IGNORECASE | re.DOTALL)
+    if match:
+        pieces = [
+            re.sub(r"^(?:in|the)\s+", "", piece.strip(" ?!.,"), flags=re.IGNORECASE)
+            for piece in _CITY_SEPARATORS.split(match.group(1))
+        ]
+        # split() with a capturing group alternates parts and separators (a comma strips to "")
+        parts = [pieces[0]]
+        for separator, part in zip(pieces[1::2], pieces[2::2]):
+            if not separator and parts[-1] and _is_qualifier(gazetteer, parts[-1], _sanitize_city_name(part)):
+                parts[-1] = f"{parts[-1]}, {_sanitize_city_name(part)}"
+            else:
+                parts.append(part)
+        candidates: List[str] = []
+        for part in parts:
+            if "," in part:
+                place = gazetteer.lookup(part)
+                candidates.append(place.name if place is not None else _sanitize_city_name(part))
+                continue
+            places = gazetteer.find_in_text(part)
+            if places:
+                candidates.extend(p.name for p in places)
+            else:
+                candidates.append(_sanitize_city_name(part))
+    else:
+        candidates = [p.name for p in gazetteer.find_in_text(question, require_capitalized=True)]
+
+    cities: List[str] = []
+    seen = set()
+    for city in candidates:
+        if city and city.lower() not in seen:
+            seen.add(city.lower())
+            cities.append(city)
+    return cities
+
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Shared HTTP session so concurrent lookups reuse pooled keep-alive connections."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            pool_size = max(1, get_settings().weather_max_concurrency)
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            _SESSION = session
+    return _SESSION
+
+
+# key -> (expires_at, data), least recently used first
+_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _cached(key: tuple, fetch) -> Dict[str, Any]:
+    settings = get_settings()
+    ttl = settings.weather_cache_ttl_s
+    max_entries = settings.weather_cache_max_entries
+    if ttl <= 0 or max_entries <= 0:
+        return fetch()
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            if hit[0] > now:
+                _CACHE.move_to_end(key)
+                return hit[1]
+            del _CACHE[key]
+    data = fetch()
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        _CACHE[key] = (now + ttl, data)
+        _CACHE.move_to_end(key)
+        # Free-text city names make the key space unbounded: drop expired entries, then the least recently used
+        if len(_CACHE) > max_entries:
+            for stale in [k for k, (expires_at, _) in _CACHE.items() if expires_at <= now]:
+                del _CACHE[stale]
+        while len(_CACHE) > max_entries:
+            _CACHE.popitem(last=False)
+    return data
+
+
+def _get(session: requests.Session, url: str, params: Dict[str, Any]) -> requests.Response:
+    """GET through the "weather" admission backend; 429/503 are raised there so they back off and retry."""
+    def _request() -> requests.Response:
+        resp = session.get(url, params=params, timeout=15)
+        if resp.status_code in (429, 503):
+            resp.raise_for_status()
+        return resp
+
+    return admit("weather", _request)
+
+
 def fetch_weather(city: str, units: str = "metric") -> Dict[str, Any]:
+    """Current weather for `city`.
+
+    Gazetteer cities are queried by coordinates (no name ambiguity or 404 retry) and
+    cached under their canonical identity for WEATHER_CACHE_TTL_S; other names use
+    OpenWeather's `q=` lookup with a last-token retry on 404. Cache misses go
+    through the "weather" admission backend (rate limit, concurrency cap, backoff).
+    """
     settings = get_settings()
     if not settings.openweather_api_key:
         raise ValueError("Missing OPENWEATHER_API_KEY in environment")
 
     url = "https://api.openweathermap.org/data/2.5/weather"
+    session = _get_session()
+    place = get_gazetteer().lookup(city)
+    if place is not None:
+        def _by_coords() -> Dict[str, Any]:
+            params = {"lat": place.lat, "lon": place.lon, "appid": settings.openweather_api_key, "units": units}
+            resp = _get(session, url, params)
+            resp.raise_for_status()
+            return resp.json()
+
+        return _cached((place.key, units), _by_coords)
+
     primary_city = _sanitize_city_name(city)
-    params = {"q": primary_city, "appid": settings.openweather_api_key, "units": units}
-    resp = requests.get(url, params=params, timeout=15)
-    try:
-        resp.raise_for_status()
-        return resp.json()
-    except requests.HTTPError as exc:
-        if resp.status_code == 404:
-            # Fallback: try the last token only (e.g., drop 'now' or accidental extras)
-            last_only = primary_city.split()[-1] if primary_city.split() else primary_city
-            if last_only and last_only != primary_city:
-                resp2 = requests.get(url, params={"q": last_only, "appid": settings.openweather_api_key, "units": units}, timeout=15)
-                resp2.raise_for_status()
-                return resp2.json()
-        raise
+
+    def _by_name() -> Dict[str, Any]:
+        params = {"q": primary_city, "appid": settings.openweather_api_key, "units": units}
+        resp = _get(session, url, params)
+        try:
+            resp.raise_for_status()
+            return resp.json()
+        except requests.HTTPError as exc:
+            if resp.status_code == 404:
+                # Fallback: try the last token only (e.g., drop 'now' or accidental extras)
+                last_only = primary_city.split()[-1] if primary_city.split() else primary_city
+                if last_only and last_only != primary_city:
+                    resp2 = _get(session, url, {"q": last_only, "appid": settings.openweather_api_key, "units": units})
+                    resp2.raise_for_status()
+                    return resp2.json()
+            raise
+
+    return _cached((primary_city.lower(), units), _by_name)
 
 
 def summarize_weather(weather_json: Dict[str, Any], city: str) -> str:
     try:
-        llm = build_llm()
+        llm = get_llm()
         prompt = build_answer_prompt(
             "You turn raw weather JSON into a brief, user-friendly summary. Be concise and practical."
         )
@@ -67,17 +216,60 @@ def summarize_weather(weather_json: Dict[str, Any], city: str) -> str:
         return format_output(result)
     except Exception:
         # Fallback deterministic summary without LLM
-        main = weather_json.get("weather", [{}])[0].get("description", "weather data")
-        temp = weather_json.get("main", {}).get("temp")
-        humidity = weather_json.get("main", {}).get("humidity")
-        wind = weather_json.get("wind", {}).get("speed")
-        parts = [f"Current conditions in {city}: {main}."]
-        if temp is not None:
-            parts.append(f"Temperature: {temp}°C.")
-        if humidity is not None:
-            parts.append(f"Humidity: {humidity}%.")
-        if wind is not None:
-            parts.append(f"Wind: {wind} m/s.")
-        return " " .join(parts)
+        return template_summary(weather_json, city)
+
+
+def template_summary(weather_json: Dict[str, Any], city: str) -> str:
+    main = weather_json.get("weather", [{}])[0].get("description", "weather data")
+    temp = weather_json.get("main", {}).get("temp")
+    humidity = weather_json.get("main", {}).get("humidity")
+    wind = weather_json.get("wind", {}).get("speed")
+    parts = [f"Current conditions in {city}: {main}."]
+    if temp is not None:
+        parts.append(f"Temperature: {temp}°C.")
+    if humidity is not None:
+        parts.append(f"Humidity: {humidity}%.")
+    if wind is not None:
+        parts.append(f"Wind: {wind} m/s.")
+    return " " .join(parts)
+
+
+def fetch_weather_many(cities: List[str], units: str = "metric") -> List[Dict[str, Any]]:
+    """Fetch several cities concurrently; one failing city does not fail the others.
+
+    Returns `[{"city", "data"}]` or `[{"city", "error"}]` entries in input order.
+    """
+    def _one(city: str) -> Dict[str, Any]:
+        try:
+            return {"city": city, "data": fetch_weather(city, units)}
+        except Exception as exc:
+            return {"city": city, "error": str(exc)}
+
+    if len(cities) <= 1:
+        return [_one(c) for c in cities]
+    workers = min(len(cities), max(1, get_settings().weather_max_concurrency))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weather") as pool:
+        return list(map_in_context(pool, _one, cities))
+
+
+def summarize_weather_many(results: List[Dict[str, Any]]) -> str:
+    """Summarize several cities' weather with a single LLM call (templated fallback)."""
+    ok = [r for r in results if "data" in r]
+    failed = [r for r in results if "error" in r]
+    notes = [f"Weather for {r['city']} is unavailable right now." for r in failed]
+    if not ok:
+        return " ".join(notes)
+    try:
+        llm = get_llm()
+        prompt = build_answer_prompt(
+            "You turn raw weather JSON for several cities into a brief, user-friendly comparison. "
+            "Give each city one or two sentences. Be concise and practical."
+        )
+        context = "\n\n".join(f"{r['city']}: {r['data']}" for r in ok)
+        question = f"Summarize the current weather for: {', '.join(r['city'] for r in ok)}."
+        summary = format_output((prompt | llm).invoke({"context": context, "question": question}))
+    except Exception:
+        summary = "\n".join(template_summary(r["data"], r["city"]) for r in ok)
+    return "\n".join([summary] + notes) if notes else summary
 
 
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from src.admission import Backend, BackendBusy, rate_limit_delay
+
+
+def _http_error(status, retry_after=None):
+    resp = requests.Response()
+    resp.status_code = status
+    if retry_after is not None:
+        resp.headers["Retry-After"] = retry_after
+    return requests.HTTPError(response=resp)
+
+
+def test_rate_limit_delay_reads_retry_after():
+    assert rate_limit_delay(_http_error(429, "2")) == 2.0
+    assert rate_limit_delay(_http_error(503)) == 0.0
+    assert rate_limit_delay(_http_error(404)) is None
+    assert rate_limit_delay(ValueError("boom")) is None
+
+
+def test_backend_retries_after_429_honoring_retry_after():
+    calls = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise _http_error(429, "0.2")
+        return "ok"
+
+    backend = Backend("test", queue_timeout_s=5)
+    assert backend.call(flaky) == "ok"
+    assert calls[1] - calls[0] >= 0.2
+    assert backend.snapshot()["rate_limited"] == 1
+
+
+def test_backend_sheds_when_rate_or_concurrency_is_exhausted():
+    limited = Backend("rate", rate_per_s=1, burst=1, queue_timeout_s=0.1)
+    assert limited.call(lambda: 1) == 1
+    with pytest.raises(BackendBusy):
+        limited.call(lambda: 2)  # next token is ~1s away, past the 0.1s deadline
+
+    release = threading.Event()
+    capped = Backend("capped", max_concurrency=1, queue_timeout_s=0.1)
+    worker = threading.Thread(target=capped.call, args=(lambda: release.wait(5),))
+    worker.start()
+    time.sleep(0.05)
+    with pytest.raises(BackendBusy):
+        capped.call(lambda: None)
+    release.set()
+    worker.join()
+    assert capped.snapshot()["shed"] == 1
+
+
+def test_deadline_scope_reaches_pool_workers():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.admission import _DEADLINE, deadline_scope, map_in_context, submit_in_context
+
+    with ThreadPoolExecutor(max_workers=2) as pool, deadline_scope(5):
+        expected = _DEADLINE.get()
+        assert pool.submit(_DEADLINE.get).result() is None
+        assert submit_in_context(pool, _DEADLINE.get).result() == expected
+        assert list(map_in_context(pool, lambda _: _DEADLINE.get(), range(3))) == [expected] * 3
+
+        # A short scope is what sheds a queued call in a router/fan-out thread
+        backend = Backend("ctx", max_concurrency=1, queue_timeout_s=5)
+        backend._slots.acquire()
+        with deadline_scope(0.05):
+            with pytest.raises(BackendBusy):
+                submit_in_context(pool, backend.call, lambda: "late").result(timeout=2)
+
+
+def test_wait_while_busy_retries_until_admitted_or_out_of_time():
+    from src.admission import wait_while_busy
+
+    attempts = []
+
+    def shed_twice():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise BackendBusy("embeddings", 0.05, "rate limit")
+        return "stored"
+
+    assert wait_while_busy(shed_twice, max_wait_s=5) == "stored"
+    assert len(attempts) == 3 and attempts[1] - attempts[0] >= 0.05
+
+    def always_busy():
+        raise BackendBusy("qdrant", 0.05, "concurrency limit")
+
+    started = time.monotonic()
+    with pytest.raises(BackendBusy):
+        wait_while_busy(always_busy, max_wait_s=0.2)
+    assert time.monotonic() - started < 1
@@ -0,0 +1,26 @@
+from src.gazetteer import Gazetteer, Place, get_gazetteer
+
+
+def test_bundled_gazetteer_resolves_aliases_and_accents():
+    gazetteer = get_gazetteer()
+    assert len(gazetteer) > 100
+    assert gazetteer.lookup("nyc").name == "New York"
+    assert gazetteer.lookup("münchen") == gazetteer.lookup("Munich")
+    assert gazetteer.lookup("Atlantis") is None
+    assert gazetteer.lookup("Paris, FR").name == gazetteer.lookup("Paris, France").name == "Paris"
+    assert gazetteer.lookup("Paris, Texas") is None
+    assert gazetteer.region_country("Deutschland") == "DE" and gazetteer.region_country("Texas") == "US"
+
+
+def test_find_in_text_prefers_longest_match_and_respects_case():
+    gazetteer = Gazetteer(
+        [
+            (Place("York", "GB", 53.96, -1.08), []),
+            (Place("New York", "US", 40.71, -74.01), ["NY"]),
+            (Place("Nice", "FR", 43.70, 7.27), []),
+        ]
+    )
+    assert [p.country for p in gazetteer.find_in_text("weather in New York and York")] == ["US", "GB"]
+    assert gazetteer.find_in_text("a nice day", require_capitalized=True) == []
+    assert gazetteer.find_in_text("ny or NY")[0].name == "New York"
+    assert len(gazetteer.find_in_text("ny or NY")) == 1
@@ -23,3 +23,20 @@ def test_router_rag():
     result = graph.invoke({"question": "Summarize section 1 of the PDF."})
     assert result["route"] == "rag"
 
+
+
+def test_weather_node_skips_store_when_vectorstore_is_busy(monkeypatch):
+    import src.graph as graph
+    from src.admission import BackendBusy
+
+    class BusyVectorStore:
+        def add_texts(self, texts, metadatas=None):
+            raise BackendBusy("qdrant", 1.0, "concurrency limit")
+
+    monkeypatch.setattr(graph, "fetch_weather", lambda city: {"name": city})
+    monkeypatch.setattr(graph, "summarize_weather", lambda raw, city: f"Mild in {city}")
+    monkeypatch.setattr(graph, "get_embeddings", lambda: None)
+    monkeypatch.setattr(graph, "get_vectorstore", lambda embeddings: BusyVectorStore())
+
+    result = graph.weather_node({"question": "What's the weather in Paris?"})
+    assert result["route"] == "weather" and result["answer"] == "Mild in Paris"
@@ -0,0 +1,72 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import src.jobs as jobs
+from src.jobs import DONE, FAILED, QUEUED, RUNNING, IngestJobManager
+
+
+def test_job_manager_tracks_progress_and_dedupes(tmp_path, monkeypatch):
+    def fake_ingest(path, collection, progress=None):
+        progress({"pages_processed": 3, "total_chunks": 5, "chunks_processed": 0})
+        progress({"chunks_processed": 5})
+        return {"num_chunks": 5, "num_pages": 3, "collection": collection, "ids": []}
+
+    monkeypatch.setattr(jobs, "ingest_pdf_into_qdrant", fake_ingest)
+    manager = IngestJobManager(str(tmp_path / "jobs.sqlite3"))
+    job_id = manager.submit("a.pdf", "docs", dedupe_key="abc")
+    job = manager.wait(job_id, poll_interval=0.01, timeout=5)
+    assert job["status"] == DONE
+    assert job["pages_processed"] == 3 and job["chunks_processed"] == 5
+    assert manager.submit("a-copy.pdf", "docs", dedupe_key="abc") == job_id
+    manager.shutdown()
+
+
+def test_job_manager_records_failures(tmp_path, monkeypatch):
+    def failing_ingest(path, collection, progress=None):
+        raise RuntimeError("qdrant down")
+
+    monkeypatch.setattr(jobs, "ingest_pdf_into_qdrant", failing_ingest)
+    manager = IngestJobManager(str(tmp_path / "jobs.sqlite3"))
+    job = manager.wait(manager.submit("a.pdf", "docs"), poll_interval=0.01, timeout=5)
+    assert job["status"] == FAILED and "qdrant down" in job["error"]
+    manager.shutdown()
+
+
+def test_job_manager_only_recovers_jobs_of_dead_owners(tmp_path, monkeypatch):
+    release = threading.Event()
+
+    def slow_ingest(path, collection, progress=None):
+        release.wait(5)
+        return {"num_chunks": 1, "num_pages": 1, "collection": collection, "ids": []}
+
+    monkeypatch.setattr(jobs, "ingest_pdf_into_qdrant", slow_ingest)
+    db = str(tmp_path / "jobs.sqlite3")
+    first = IngestJobManager(db)
+    live = first.submit("live.pdf", "docs")
+    while first.get_job(live)["status"] != RUNNING:
+        time.sleep(0.01)
+
+    # An orphan left by a process that stopped heartbeating long ago
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "INSERT INTO ingest_jobs (id, path, collection, status, created_at, owner, heartbeat_at) "
+            "VALUES ('orphan', 'o.pdf', 'docs', ?, 0, 'elsewhere:1:dead', 0)",
+            (QUEUED,),
+        )
+
+    reader = IngestJobManager(db, read_only=True)
+    assert reader.get_job("orphan")["status"] == QUEUED
+    with pytest.raises(RuntimeError):
+        reader.submit("x.pdf", "docs")
+    reader.shutdown()
+
+    second = IngestJobManager(db)
+    assert second.get_job(live)["status"] == RUNNING
+    release.set()
+    assert second.wait("orphan", poll_interval=0.01, timeout=5)["owner"] == second.owner
+    assert first.wait(live, poll_interval=0.01, timeout=5)["status"] == DONE
+    first.shutdown()
+    second.shutdown()
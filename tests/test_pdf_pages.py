@@ -0,0 +1,53 @@
+import src.pdf_pages as pdf_pages
+from src.pdf_pages import PageTextCache, extract_pages
+
+
+def _write_pdf(path, page_texts):
+    """Write a minimal valid PDF with one line of Helvetica text per page."""
+    n = len(page_texts)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(n))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode())
+    font_id = 3 + 2 * n
+    for i, text in enumerate(page_texts):
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def test_extract_pages_parallel_then_cached(tmp_path, monkeypatch):
+    pdf = tmp_path / "doc.pdf"
+    _write_pdf(pdf, [f"Page number {i}" for i in range(6)])
+    cache = PageTextCache(str(tmp_path / "pages.sqlite3"))
+    monkeypatch.setattr(pdf_pages, "PARALLEL_MIN_PAGES", 1)
+
+    file_hash, texts = extract_pages(pdf, backend="pypdf", workers=3, cache=cache)
+    assert [t.strip() for t in texts] == [f"Page number {i}" for i in range(6)]
+    assert cache.num_pages(file_hash) == 6
+
+    def no_parse(*_args):
+        raise AssertionError("cached pages must not be re-parsed")
+
+    monkeypatch.setitem(pdf_pages._BACKENDS, "pypdf", (no_parse, no_parse))
+    assert extract_pages(pdf, backend="pypdf", cache=cache) == (file_hash, texts)
+
+
+def test_page_ranges_cover_missing_pages():
+    ranges = pdf_pages._page_ranges([0, 1, 2, 3, 7, 8], workers=2)
+    covered = [p for s, e in ranges for p in range(s, e)]
+    assert covered == [0, 1, 2, 3, 7, 8]
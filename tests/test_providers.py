@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+import src.providers as providers
+from src.providers import Provider, ProviderRouter
+
+
+def _router(monkeypatch, names_and_fns, hedge_after_s=0.05, breaker_failures=2):
+    settings = providers.get_settings()
+    monkeypatch.setattr(settings, "provider_hedge_after_s", hedge_after_s)
+    monkeypatch.setattr(settings, "provider_breaker_failures", breaker_failures)
+    monkeypatch.setattr(settings, "provider_breaker_cooldown_s", 60)
+    return ProviderRouter("test", [Provider(name, lambda fn=fn: fn) for name, fn in names_and_fns])
+
+
+def test_router_fails_over_and_opens_breaker(monkeypatch):
+    def broken(_):
+        raise RuntimeError("503 from upstream")
+
+    router = _router(monkeypatch, [("primary", broken), ("backup", lambda q: f"backup:{q}")])
+    for _ in range(2):
+        assert router.call(lambda client: client("hi")) == ("backup:hi", "backup")
+    stats = {s["provider"]: s for s in router.stats()}
+    assert stats["primary"]["errors"] == 2 and stats["primary"]["circuit"] == "open"
+    # With the breaker open the primary is skipped entirely
+    assert router.call(lambda client: client("hi")) == ("backup:hi", "backup")
+    assert router.stats()[0]["calls"] == 2
+
+
+def test_router_hedges_slow_primary(monkeypatch):
+    release = threading.Event()
+
+    def slow(q):
+        release.wait(5)
+        return f"slow:{q}"
+
+    router = _router(monkeypatch, [("slow", slow), ("fast", lambda q: f"fast:{q}")])
+    started = time.perf_counter()
+    assert router.call(lambda client: client("hi")) == ("fast:hi", "fast")
+    assert time.perf_counter() - started < 2
+    release.set()
+    assert "test" in providers.router_stats()
+
+
+def test_router_stays_busy_when_every_provider_sheds(monkeypatch):
+    from src.admission import BackendBusy
+
+    def shed(retry_after):
+        def call(_):
+            raise BackendBusy("llm:x", retry_after, "rate limit")
+        return call
+
+    router = _router(monkeypatch, [("primary", shed(3.0)), ("backup", shed(0.5))])
+    with pytest.raises(BackendBusy) as info:
+        router.call(lambda client: client("hi"))
+    assert info.value.retry_after == 0.5
+    # Shedding is not a provider failure
+    assert all(s["errors"] == 0 and s["circuit"] != "open" for s in router.stats())
+
+    def broken(_):
+        raise ValueError("bad request")
+
+    router = _router(monkeypatch, [("primary", shed(1.0)), ("backup", broken)])
+    with pytest.raises(RuntimeError, match="providers failed") as info:
+        router.call(lambda client: client("hi"))
+    assert not isinstance(info.value, BackendBusy)
+
+
+def test_routed_embeddings_is_a_langchain_embeddings(monkeypatch):
+    from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+    from langchain_qdrant import Qdrant
+    from qdrant_client import QdrantClient
+
+    from src.embeddings import RoutedEmbeddings
+
+    fake = DeterministicFakeEmbedding(size=8)
+    routed = RoutedEmbeddings(_router(monkeypatch, [("local", fake)]))
+    assert isinstance(routed, Embeddings)
+    assert routed.embed_query("hello") == fake.embed_query("hello")
+
+    # Qdrant takes Embeddings instances through `embeddings`, not the legacy `embedding_function` path
+    vs = Qdrant(client=QdrantClient(":memory:"), collection_name="docs", embeddings=routed)
+    assert vs.embeddings is routed and vs._embeddings_function is None
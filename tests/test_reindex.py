@@ -0,0 +1,124 @@
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+
+from src.chunk_store import ChunkStore
+from src.reindex import reindex_collection, resolve_alias
+
+
+def _store_with_chunks(tmp_path):
+    store = ChunkStore(str(tmp_path / "chunks.sqlite3"))
+    ids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(3)]
+    store.replace_file("docs", "hash", ids, ["alpha", "beta", "gamma"], [{"page": i} for i in range(3)])
+    return store
+
+
+def test_reindex_switches_alias_between_shadow_collections(tmp_path):
+    client = QdrantClient(":memory:")
+    store = _store_with_chunks(tmp_path)
+
+    first = reindex_collection("docs", target="docs_v1", embeddings=DeterministicFakeEmbedding(size=8),
+                               client=client, store=store, batch_size=2)
+    assert first["previous"] is None and resolve_alias(client, "docs") == "docs_v1"
+
+    second = reindex_collection("docs", target="docs_v2", embeddings=DeterministicFakeEmbedding(size=16),
+                                client=client, store=store, drop_old=True)
+    assert second["previous"] == "docs_v1" and second["dimension"] == 16
+    assert resolve_alias(client, "docs") == "docs_v2"
+    assert not client.collection_exists("docs_v1")
+    points, _ = client.scroll("docs_v2", with_payload=True)
+    assert sorted(p.payload["page_content"] for p in points) == ["alpha", "beta", "gamma"]
+
+
+def test_reindex_refuses_to_replace_plain_collection_without_opt_in(tmp_path):
+    from qdrant_client.http.models import Distance, VectorParams
+
+    client = QdrantClient(":memory:")
+    client.create_collection("docs", vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+    with pytest.raises(RuntimeError, match="plain collection"):
+        reindex_collection("docs", embeddings=DeterministicFakeEmbedding(size=8), client=client,
+                           store=_store_with_chunks(tmp_path))
+
+
+def test_chunk_store_replace_reports_stale_ids(tmp_path):
+    store = _store_with_chunks(tmp_path)
+    stale = store.replace_file("docs", "hash", ["new-id"], ["delta"], [{}])
+    assert len(stale) == 3 and store.count("docs") == 1
+
+
+def test_ensure_collection_creates_aliased_collection_on_fresh_install():
+    from src.vectorstore import ensure_collection
+
+    client = QdrantClient(":memory:")
+    ensure_collection(client, "docs", vector_size=8)
+    ensure_collection(client, "docs", vector_size=8)
+    assert resolve_alias(client, "docs") == "docs_v1"
+    assert [c.name for c in client.get_collections().collections] == ["docs_v1"]
+
+
+def test_reindex_catches_up_on_chunks_changed_during_the_copy(tmp_path):
+    client = QdrantClient(":memory:")
+    store = _store_with_chunks(tmp_path)
+    late = "00000000-0000-0000-0000-000000000009"
+    changed = []
+
+    def progress(done, total):
+        # An ingest finishing mid-run: one new file, and the first file re-chunked to fewer chunks
+        if not changed:
+            changed.append(done)
+            store.replace_file("docs", "other", [late], ["delta"], [{}])
+            store.replace_file("docs", "hash", ["00000000-0000-0000-0000-000000000000"], ["alpha"], [{}])
+
+    result = reindex_collection("docs", target="docs_v2", embeddings=DeterministicFakeEmbedding(size=8),
+                                client=client, store=store, batch_size=1, progress=progress)
+    points, _ = client.scroll("docs_v2", with_payload=True)
+    assert sorted(p.payload["page_content"] for p in points) == ["alpha", "delta"]
+    assert result["num_chunks"] == 2
+
+
+def test_reindex_keeps_chunks_of_an_ingest_in_flight_across_the_switch(tmp_path, monkeypatch):
+    import threading
+
+    from langchain_core.documents import Document
+    from langchain_qdrant import Qdrant
+
+    import src.rag as rag
+    from src.vectorstore import ensure_collection
+
+    client = QdrantClient(":memory:")
+    ensure_collection(client, "docs", vector_size=8)
+    store = _store_with_chunks(tmp_path)
+    embeddings = DeterministicFakeEmbedding(size=8)
+    vs = Qdrant(client=client, collection_name="docs", embeddings=embeddings)
+    upserted, finish = threading.Event(), threading.Event()
+    add_documents = rag._add_documents
+
+    def add_then_stall(vs, docs, ids=None):
+        # The upsert hits the old collection; the job is still running when the alias switches
+        result = add_documents(vs, docs, ids)
+        upserted.set()
+        finish.wait(5)
+        return result
+
+    monkeypatch.setattr(rag, "load_pdf", lambda path, on_page=None: [
+        Document("late chunk", metadata={"source": "late.pdf", "file_sha256": "late", "page": 0})
+    ])
+    monkeypatch.setattr(rag, "get_embeddings", lambda: embeddings)
+    monkeypatch.setattr(rag, "get_vectorstore", lambda embeddings, collection=None: vs)
+    monkeypatch.setattr(rag, "get_chunk_store", lambda: store)
+    monkeypatch.setattr(rag, "_add_documents", add_then_stall)
+    ingest = threading.Thread(target=rag.ingest_pdf_into_qdrant, args=("late.pdf",), kwargs={"summaries": False})
+    switch = client.update_collection_aliases
+
+    def ingest_then_switch(**kwargs):
+        ingest.start()
+        assert upserted.wait(5)
+        return switch(**kwargs)
+
+    monkeypatch.setattr(client, "update_collection_aliases", ingest_then_switch)
+    reindex_collection("docs", target="docs_v2", embeddings=embeddings, client=client, store=store)
+    finish.set()
+    ingest.join(5)
+
+    points, _ = client.scroll("docs_v2", with_payload=True)
+    assert sorted(p.payload["page_content"] for p in points) == ["alpha", "beta", "gamma", "late chunk"]
@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from src.admission import BackendBusy
+from src.config import get_settings
+from src.service import create_app
+
+
+class EchoGraph:
+    async def ainvoke(self, state):
+        return {"answer": state["question"].upper(), "route": "rag", "sources": [state.get("file_sha256")]}
+
+    async def astream(self, state, stream_mode="updates"):
+        yield {"rag": await self.ainvoke(state)}
+
+
+def test_ask_and_stream_use_injected_graph():
+    with TestClient(create_app(graph=EchoGraph())) as client:
+        assert client.get("/healthz").json()["graph_ready"] is True
+        res = client.post("/ask", json={"question": "hi"}).json()
+        assert res["answer"] == "HI" and res["route"] == "rag"
+        assert client.post("/ask", json={"question": "hi", "file_sha256": "abc"}).json()["sources"] == ["abc"]
+        body = client.post("/ask/stream", json={"question": "hi"}).text
+        assert '"answer": "HI"' in body and "event: end" in body
+
+
+class BusyGraph(EchoGraph):
+    async def ainvoke(self, state):
+        raise BackendBusy("llm:google", 2.5, "queue full")
+
+
+def test_ask_sheds_busy_backend_with_retry_after():
+    with TestClient(create_app(graph=BusyGraph())) as client:
+        res = client.post("/ask", json={"question": "hi"})
+        assert res.status_code == 503 and res.headers["Retry-After"] == "3"
+
+
+class RecordingJobs:
+    def __init__(self):
+        self.paths = []
+
+    def submit(self, path, collection=None):
+        self.paths.append(path)
+        return "job-1"
+
+
+def test_ingest_only_accepts_pdfs_under_ingest_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "service_ingest_dir", str(tmp_path))
+    (tmp_path / "a.pdf").write_bytes(b"%PDF-1.4")
+    jobs = RecordingJobs()
+    with TestClient(create_app(graph=EchoGraph(), job_manager=jobs)) as client:
+        assert client.post("/ingest", json={"path": "a.pdf"}).status_code == 202
+        assert client.post("/ingest", json={"path": "../../etc/passwd"}).status_code == 403
+        assert client.post("/ingest", json={"path": "/etc/hosts"}).status_code == 403
+        assert client.post("/ingest", json={"path": "missing.pdf"}).status_code == 404
+        client.post("/ask/stream", json={"question": "hi"})
+        assert client.get("/healthz").json()["in_flight"] == 0
+    assert jobs.paths == [str((tmp_path / "a.pdf").resolve())]
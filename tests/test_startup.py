@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+import src.startup as startup
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def test_importing_graph_defers_provider_modules():
+    code = (
+        "import sys, src.graph\n"
+        "heavy = ['langgraph', 'qdrant_client', 'langchain_qdrant', 'langchain_huggingface',\n"
+        "         'huggingface_hub', 'langchain_google_genai', 'langchain_community', 'streamlit']\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
+
+
+def test_prewarm_runs_only_requested_steps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(startup, "_prewarm_steps", lambda: [(n, lambda n=n: calls.append(n)) for n in ("a", "b", "c")])
+    startup.prewarm_in_background(["a", "c"]).join(5)
+    assert calls == ["a", "c"]
@@ -0,0 +1,142 @@
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_qdrant import Qdrant
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+import src.rag as rag
+from src.admission import BackendBusy
+from src.chunk_store import ChunkStore
+from src.summaries import (
+    answer_from_summaries,
+    build_summary_nodes,
+    chunks_only_filter,
+    detect_sections,
+    is_summary_question,
+)
+
+PAGES = [
+    "A Study of Things\nBy Someone\n1 Introduction\nWe study things.\n1. Collect the things first.",
+    "More intro text.\n2 Methods\nWe counted the things.",
+    "3 Results\nThere were many things.\nReferences\n[1] Things, 2020.",
+]
+
+
+def _fake_summarize(what, text):
+    return f"summary of {what}"
+
+
+def test_detect_sections_uses_numbered_and_named_headings():
+    sections = detect_sections(PAGES)
+    assert [(s.number, s.title) for s in sections] == [
+        (None, "Front matter"),
+        ("1", "Introduction"),
+        ("2", "Methods"),
+        ("3", "Results"),
+        (None, "References"),
+    ]
+    intro = sections[1]
+    assert (intro.start_page, intro.end_page) == (0, 1) and "Collect the things" in intro.text
+    assert [s.title for s in detect_sections(["plain text"] * 3, pages_per_window=2)] == ["Pages 1-2", "Pages 3-3"]
+
+
+def test_summary_nodes_are_answered_from_metadata():
+    pages = [Document(p, metadata={"source": "a.pdf", "file_sha256": "abc", "page": i}) for i, p in enumerate(PAGES)]
+    nodes = build_summary_nodes(pages, summarize=_fake_summarize)
+    levels = [n.metadata["level"] for n in nodes]
+    assert levels.count("page") == 3 and levels.count("document") == 1
+    assert "References" not in [n.metadata.get("section_title") for n in nodes]
+
+    client = QdrantClient(":memory:")
+    client.create_collection("docs", vectors_config=VectorParams(size=8, distance=Distance.COSINE))
+    vs = Qdrant(client=client, collection_name="docs", embeddings=DeterministicFakeEmbedding(size=8))
+    vs.add_documents([Document("We counted the things.", metadata={"page": 1})] + nodes)
+
+    assert is_summary_question("Summarize section 2") and not is_summary_question("How many things?")
+    assert answer_from_summaries("Summarize section 2", vs)["answer"].startswith("Section 2: Methods")
+    assert answer_from_summaries("Summarize the introduction", vs)["sources"][0]["section_key"] == "introduction"
+    assert answer_from_summaries("Give me an overview of page 3", vs)["answer"].startswith("Page 3")
+    assert answer_from_summaries("Summarize the whole document", vs)["sources"][0]["level"] == "document"
+
+    chunks = client.query_points("docs", query=[0.1] * 8, query_filter=chunks_only_filter(), limit=10).points
+    assert [p.payload["page_content"] for p in chunks] == ["We counted the things."]
+
+
+def _vectorstore():
+    client = QdrantClient(":memory:")
+    client.create_collection("docs", vectors_config=VectorParams(size=8, distance=Distance.COSINE))
+    return Qdrant(client=client, collection_name="docs", embeddings=DeterministicFakeEmbedding(size=8))
+
+
+def test_summary_lookup_does_not_fall_back_or_mix_files():
+    vs = _vectorstore()
+    for name, sha in (("a.pdf", "abc"), ("b.pdf", "def")):
+        pages = [Document(p, metadata={"source": name, "file_sha256": sha, "page": i}) for i, p in enumerate(PAGES)]
+        vs.add_documents(build_summary_nodes(pages, summarize=_fake_summarize))
+
+    # "section 9" does not exist: no other section's summary stands in for it
+    assert answer_from_summaries("Summarize section 9", vs, file_sha256="abc") is None
+    # Two PDFs have a section 2: ambiguous unless the file is given
+    assert answer_from_summaries("Summarize section 2", vs) is None
+    picked = answer_from_summaries("Summarize section 2", vs, file_sha256="def")
+    assert picked["sources"][0]["source"] == "b.pdf" and picked["answer"].startswith("Section 2: Methods")
+
+
+    # With PDF chunks present, the lookup is scoped to the file whose chunk best matches the question
+    question = "Summarize section 2 of the counting report"
+    vs.add_documents([Document(question, metadata={"source": "b.pdf", "file_sha256": "def", "page": 1})])
+    assert answer_from_summaries(question, vs)["sources"][0]["source"] == "b.pdf"
+
+
+def test_generic_summary_questions_need_a_close_match(monkeypatch):
+    from src import summaries
+
+    vs = _vectorstore()
+    assert not summaries.summaries_available(vs)
+    pages = [Document(p, metadata={"source": "a.pdf", "file_sha256": "abc", "page": i}) for i, p in enumerate(PAGES)]
+    vs.add_documents(build_summary_nodes(pages, summarize=_fake_summarize))
+    monkeypatch.setattr(summaries, "_PRESENCE", {})
+    assert summaries.summaries_available(vs)
+
+    settings = summaries.get_settings()
+    monkeypatch.setattr(settings, "summary_min_score", 0.99)
+    assert answer_from_summaries("Give an overview of the pricing model", vs, file_sha256="abc") is None
+    monkeypatch.setattr(settings, "summary_min_score", -1.0)
+    assert answer_from_summaries("Give an overview of the pricing model", vs, file_sha256="abc")["sources"][0]["level"] in (
+        "section",
+        "document",
+    )
+
+
+def test_summary_mode_follows_ingest_summaries_by_default(monkeypatch):
+    settings = rag.get_settings()
+    monkeypatch.setattr(settings, "rag_summary_mode", "")
+    monkeypatch.setattr(settings, "ingest_summaries", "false")
+    assert not rag._summary_mode()
+    monkeypatch.setattr(settings, "ingest_summaries", "true")
+    assert rag._summary_mode()
+    monkeypatch.setattr(settings, "rag_summary_mode", "off")
+    assert not rag._summary_mode()
+
+
+def test_ingest_keeps_chunks_when_summaries_fail(tmp_path, monkeypatch):
+    vs = _vectorstore()
+    store = ChunkStore(str(tmp_path / "chunks.sqlite3"))
+    pages = [Document(p, metadata={"source": "a.pdf", "file_sha256": "abc", "page": i}) for i, p in enumerate(PAGES)]
+
+    def busy(docs):
+        raise BackendBusy("llm:google", 1.0, "rate limit")
+
+    monkeypatch.setattr(rag, "load_pdf", lambda path, on_page=None: pages)
+    monkeypatch.setattr(rag, "get_embeddings", lambda: vs.embeddings)
+    monkeypatch.setattr(rag, "get_vectorstore", lambda embeddings, collection=None: vs)
+    monkeypatch.setattr(rag, "get_chunk_store", lambda: store)
+    monkeypatch.setattr(rag, "build_summary_nodes", busy)
+
+    result = rag.ingest_pdf_into_qdrant("a.pdf", summaries=True)
+    assert result["num_chunks"] == 3 and result["num_summaries"] == 0
+    assert store.count("docs") == 3 and vs.client.count("docs").count == 3
+
+    monkeypatch.setattr(rag, "build_summary_nodes", lambda docs: build_summary_nodes(docs, summarize=_fake_summarize))
+    result = rag.ingest_pdf_into_qdrant("a.pdf", summaries=True)
+    assert store.count("docs") == 3 + result["num_summaries"] == vs.client.count("docs").count
@@ -0,0 +1,51 @@
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src import rag
+from src.config import get_settings
+from src.vectorstore import build_search_params
+
+
+def test_build_search_params_defaults_to_server_settings():
+    assert build_search_params() is None
+    assert build_search_params(hnsw_ef=0, rescore=None, oversampling=0.0) is None
+
+
+def test_build_search_params_sets_ef_and_quantization():
+    params = build_search_params(hnsw_ef=64)
+    assert params.hnsw_ef == 64 and params.quantization is None
+
+    params = build_search_params(rescore=False, oversampling=2.0)
+    assert params.hnsw_ef is None
+    assert params.quantization.rescore is False and params.quantization.oversampling == 2.0
+
+
+def test_get_retriever_applies_search_knobs(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "rag_search_k", 7)
+    monkeypatch.setattr(settings, "rag_hnsw_ef", 128)
+    monkeypatch.setattr(settings, "rag_quantization_rescore", "true")
+    monkeypatch.setattr(settings, "rag_quantization_oversampling", 3.0)
+    captured = {}
+
+    class FakeVectorStore:
+        def as_retriever(self, search_kwargs):
+            captured.update(search_kwargs)
+
+    monkeypatch.setattr(rag, "get_embeddings", lambda: DeterministicFakeEmbedding(size=8))
+    monkeypatch.setattr(rag, "get_vectorstore", lambda embeddings, collection: FakeVectorStore())
+
+    rag.get_retriever()
+    assert captured["k"] == 7
+    assert captured["search_params"].hnsw_ef == 128
+    assert captured["search_params"].quantization.rescore is True
+    assert captured["search_params"].quantization.oversampling == 3.0
+
+    rag.get_retriever(search_k=2)
+    assert captured["k"] == 2
+
+    monkeypatch.setattr(settings, "rag_hnsw_ef", 0)
+    monkeypatch.setattr(settings, "rag_quantization_rescore", "")
+    monkeypatch.setattr(settings, "rag_quantization_oversampling", 0.0)
+    captured.clear()
+    rag.get_retriever()
+    assert "search_params" not in captured
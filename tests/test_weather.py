@@ -1,7 +1,10 @@
 import os
 import pytest
 
-from src.weather import fetch_weather
+import time
+
+import src.weather as weather
+from src.weather import extract_cities, fetch_weather, fetch_weather_many
 
 
 @pytest.mark.skipif(not os.getenv("OPENWEATHER_API_KEY"), reason="OPENWEATHER_API_KEY not set")
@@ -10,3 +13,55 @@ def test_fetch_weather_paris():
     assert "weather" in data and "main" in data
 
 
+def test_extract_cities_handles_lists_and_stopwords():
+    assert extract_cities("What's the weather in Paris and Berlin and Rome?") == ["Paris", "Berlin", "Rome"]
+    assert extract_cities("Weather in New York, London & Tokyo now") == ["New York", "London", "Tokyo"]
+    assert extract_cities("weather in Paris and in paris today") == ["Paris"]
+    assert extract_cities("what's the forecast?") == []
+    # A country or state after a comma qualifies the city instead of being a second place
+    assert extract_cities("weather in Paris, France") == ["Paris"]
+    assert extract_cities("Weather in Paris, FR today?") == ["Paris"]
+    assert extract_cities("weather in Hamburg, Germany and Lyon") == ["Hamburg", "Lyon"]
+    assert extract_cities("weather in Paris, France, Berlin, Germany") == ["Paris", "Berlin"]
+    assert extract_cities("weather in Paris, Texas and Rome") == ["Paris, Texas", "Rome"]
+    assert extract_cities("weather in Paris, Singapore") == ["Paris", "Singapore"]
+
+
+def test_fetch_weather_many_runs_concurrently_and_isolates_errors(monkeypatch):
+    def fake_fetch(city, units="metric"):
+        time.sleep(0.2)
+        if city == "Atlantis":
+            raise ValueError("city not found")
+        return {"name": city}
+
+    monkeypatch.setattr(weather, "fetch_weather", fake_fetch)
+    started = time.perf_counter()
+    results = fetch_weather_many(["Paris", "Berlin", "Atlantis", "Rome"])
+    assert time.perf_counter() - started < 0.6
+    assert [r["city"] for r in results] == ["Paris", "Berlin", "Atlantis", "Rome"]
+    assert results[0]["data"] == {"name": "Paris"} and "city not found" in results[2]["error"]
+
+
+def test_weather_cache_is_bounded_lru_with_ttl(monkeypatch):
+    settings = weather.get_settings()
+    monkeypatch.setattr(settings, "weather_cache_ttl_s", 60)
+    monkeypatch.setattr(settings, "weather_cache_max_entries", 2)
+    monkeypatch.setattr(weather, "_CACHE", weather.OrderedDict())
+    fetches = []
+
+    def fetcher(name):
+        return lambda: fetches.append(name) or {"name": name}
+
+    weather._cached(("a",), fetcher("a"))
+    weather._cached(("b",), fetcher("b"))
+    weather._cached(("a",), fetcher("a"))  # hit; "b" is now least recently used
+    weather._cached(("c",), fetcher("c"))
+    assert list(weather._CACHE) == [("a",), ("c",)]
+    assert fetches == ["a", "b", "c"]
+
+    monkeypatch.setattr(settings, "weather_cache_ttl_s", 0.01)
+    weather._cached(("d",), fetcher("d"))
+    time.sleep(0.02)
+    weather._cached(("d",), fetcher("d"))
+    assert fetches[-2:] == ["d", "d"]
+    assert len(weather._CACHE) == 2